@@ -13,4 +13,15 @@ class UserProfileAdmin(admin.ModelAdmin):
 
 
 admin.site.register(Noticia)
-admin.site.register(Voto)
+
+
+@admin.register(Voto)
+class VotoAdmin(admin.ModelAdmin):
+    def get_queryset(self, request):
+        # The changelist renders Voto.__str__ per row: join usuario and
+        # noticia, but not the noticia's captured_html
+        qs = Voto.objects.with_display()
+        ordering = self.get_ordering(request)
+        if ordering:
+            qs = qs.order_by(*ordering)
+        return qs
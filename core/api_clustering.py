@@ -15,6 +15,7 @@ from core.models import (
 )
 from core.views import get_voter_identifier
 from core.tasks import update_voter_clusters
+from core.clustering.pca import quantize_projection
 import logging
 
 logger = logging.getLogger(__name__)
@@ -98,8 +99,8 @@ def cluster_data(request):
         {
             "voter_id": p.voter_id,
             "voter_type": p.voter_type,
-            "x": p.projection_x,
-            "y": p.projection_y,
+            "x": quantize_projection(p.projection_x),
+            "y": quantize_projection(p.projection_y),
             "n_votes": p.n_votes_cast,
         }
         for p in projections
@@ -111,7 +112,10 @@ def cluster_data(request):
         {
             "id": c.cluster_id,
             "size": c.size,
-            "centroid": [c.centroid_x, c.centroid_y],
+            "centroid": [
+                quantize_projection(c.centroid_x),
+                quantize_projection(c.centroid_y),
+            ],
             "consensus_score": c.consensus_score,
         }
         for c in base_clusters
@@ -123,7 +127,10 @@ def cluster_data(request):
         {
             "id": c.cluster_id,
             "size": c.size,
-            "centroid": [c.centroid_x, c.centroid_y],
+            "centroid": [
+                quantize_projection(c.centroid_x),
+                quantize_projection(c.centroid_y),
+            ],
             "consensus_score": c.consensus_score,
             "name": c.llm_name,
             "description": c.llm_description,
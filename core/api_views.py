@@ -141,7 +141,7 @@ class SubmitFromExtensionView(View):
                 )
 
             # Get or create Noticia
-            noticia, created = Noticia.objects.get_or_create(
+            noticia, created = Noticia.objects.with_html().get_or_create(
                 enlace=url,
                 defaults={"captured_html": html, "meta_titulo": title or None},
             )
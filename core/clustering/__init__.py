@@ -16,9 +16,12 @@ from .hierarchical import (
 from .metrics import (
     compute_cluster_consensus,
     compute_voter_similarity,
+    voter_votes_to_arrays,
     compute_silhouette_score,
     compute_cluster_voting_aggregation,
+    compute_all_cluster_aggregations,
     compute_distance_to_centroid,
+    compute_distances_to_centroids,
     compute_cluster_entities,
 )
 
@@ -32,8 +35,11 @@ __all__ = [
     'compute_group_centroids',
     'compute_cluster_consensus',
     'compute_voter_similarity',
+    'voter_votes_to_arrays',
     'compute_silhouette_score',
     'compute_cluster_voting_aggregation',
+    'compute_all_cluster_aggregations',
     'compute_distance_to_centroid',
+    'compute_distances_to_centroids',
     'compute_cluster_entities',
 ]
@@ -317,7 +317,11 @@ def get_bridge_vote_examples(run, bridge_voter_key, limit=10):
     else:
         votes = Voto.objects.filter(session_key=voter_id)
     
-    votes = votes.select_related('noticia').order_by('-fecha_voto')[:limit]
+    votes = (
+        votes.select_related('noticia')
+        .defer('noticia__captured_html')
+        .order_by('-fecha_voto')[:limit]
+    )
     
     # Get cluster opinions on same noticias
     clusters = run.clusters.filter(cluster_type='group')
@@ -64,7 +64,7 @@ def calculate_cross_cluster_consensus(run, min_votes_per_cluster=3):
             voter_to_cluster[key] = cluster.cluster_id
     
     # Get all votes for voters in this clustering
-    all_votes = Voto.objects.select_related('noticia').all()
+    all_votes = Voto.objects.select_related('noticia').defer('noticia__captured_html')
     
     # Aggregate votes by noticia and cluster
     noticia_cluster_votes = defaultdict(lambda: defaultdict(lambda: {'buena': 0, 'mala': 0, 'neutral': 0}))
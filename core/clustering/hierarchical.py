@@ -18,9 +18,10 @@ See REFERENCES.md for detailed documentation.
 
 import numpy as np
 from sklearn.cluster import KMeans
-from sklearn.metrics import silhouette_score
 import logging
 
+from .metrics import compute_silhouette_score
+
 logger = logging.getLogger(__name__)
 
 
@@ -86,7 +87,8 @@ def group_clusters(
         kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
         labels = kmeans.fit_predict(projections)
 
-        score = silhouette_score(projections, labels)
+        # Sampled for large N (same seed for every k, so scores compare)
+        score = compute_silhouette_score(projections, labels)
         silhouette_scores[k] = score
         models[k] = (labels, kmeans)
 
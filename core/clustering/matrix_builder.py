@@ -5,15 +5,62 @@ Converts vote records from the database into a sparse matrix
 suitable for PCA and clustering operations.
 """
 
-from scipy.sparse import lil_matrix
+from scipy.sparse import coo_matrix, csr_matrix
 import numpy as np
 from datetime import timedelta
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import Case, Q, SmallIntegerField, Value, When
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Opinion codes stored in the vote matrix (int8). Neutral needs a non-zero
+# code because scipy sparse matrices don't store zeros: a missing cell means
+# the voter didn't vote, a stored 1 means an explicit neutral vote.
+VOTE_BUENA = 2
+VOTE_NEUTRAL = 1
+VOTE_MALA = -2
+
+OPINION_CODES = {
+    'buena': VOTE_BUENA,
+    'neutral': VOTE_NEUTRAL,
+    'mala': VOTE_MALA,
+}
+
+
+def opinion_code_expression():
+    """
+    SQL expression mapping Voto.opinion to its OPINION_CODES value.
+
+    Unknown opinions fall back to VOTE_NEUTRAL, so rows arrive as small
+    ints and the matrix build needs no per-vote dict lookup.
+    """
+    return Case(
+        *(
+            When(opinion=opinion, then=Value(code))
+            for opinion, code in OPINION_CODES.items()
+            if code != VOTE_NEUTRAL
+        ),
+        default=Value(VOTE_NEUTRAL),
+        output_field=SmallIntegerField(),
+    )
+
+
+def opinion_values(codes):
+    """
+    Map vote matrix codes to opinion values for PCA.
+
+    buena (2) -> +1, neutral (1) -> 0, mala (-2) -> -1, missing (0) -> 0.
+    Floor division by 2 does exactly this mapping for the code set above.
+
+    Args:
+        codes: numpy array of opinion codes
+
+    Returns:
+        numpy array of the same shape with values in {-1, 0, 1}
+    """
+    return codes // 2
+
 
 def build_vote_matrix(time_window_days=30, min_votes_per_voter=3):
     """
@@ -25,14 +72,15 @@ def build_vote_matrix(time_window_days=30, min_votes_per_voter=3):
 
     Returns:
         tuple: (vote_matrix, voter_ids, noticia_ids)
-            - vote_matrix: scipy.sparse.lil_matrix (N_voters × N_noticias)
+            - vote_matrix: scipy.sparse.csr_matrix (N_voters × N_noticias),
+              int8 opinion codes
             - voter_ids: list of (voter_type, voter_id) tuples
             - noticia_ids: list of noticia primary keys
 
-    Encoding:
-        buena = +1
-        neutral = 0
-        mala = -1
+    Encoding (see OPINION_CODES):
+        buena = 2
+        neutral = 1
+        mala = -2
         no_vote = NULL (sparse)
     """
     from core.models import Voto, Noticia
@@ -40,110 +88,129 @@ def build_vote_matrix(time_window_days=30, min_votes_per_voter=3):
     # Calculate cutoff date
     cutoff_date = timezone.now() - timedelta(days=time_window_days)
 
-    # Fetch votes within time window
-    votes = Voto.objects.filter(
-        fecha_voto__gte=cutoff_date
-    ).select_related('noticia').values(
-        'usuario_id',
-        'session_key',
-        'noticia_id',
-        'opinion'
+    # Fetch votes within time window (single query, single pass), with
+    # opinions already encoded by the database
+    votes = list(
+        Voto.objects.filter(
+            fecha_voto__gte=cutoff_date
+        ).annotate(
+            opinion_code=opinion_code_expression()
+        ).values_list(
+            'usuario_id',
+            'session_key',
+            'noticia_id',
+            'opinion_code'
+        )
     )
 
-    if not votes.exists():
+    if not votes:
         logger.warning("No votes found in time window")
-        return lil_matrix((0, 0)), [], []
-
-    # Build voter identifier mapping
-    voter_id_map = {}
-    voter_vote_counts = {}
-    voter_ids_list = []
-
-    for vote in votes:
-        if vote['usuario_id']:
-            voter_key = ('user', str(vote['usuario_id']))
-        elif vote['session_key']:
-            voter_key = ('session', vote['session_key'])
-        else:
-            continue  # Skip invalid votes
-
-        # Count votes per voter
-        if voter_key not in voter_vote_counts:
-            voter_vote_counts[voter_key] = 0
-        voter_vote_counts[voter_key] += 1
+        return csr_matrix((0, 0), dtype=np.int8), [], []
+
+    n_votes = len(votes)
+    user_ids = np.fromiter(
+        (usuario_id or 0 for usuario_id, _, _, _ in votes),
+        dtype=np.int64,
+        count=n_votes,
+    )
+    noticia_ids = np.fromiter(
+        (noticia_id for _, _, noticia_id, _ in votes),
+        dtype=np.int64,
+        count=n_votes,
+    )
+    opinions = np.fromiter(
+        (code for _, _, _, code in votes),
+        dtype=np.int8,
+        count=n_votes,
+    )
+    # Session votes: anonymous votes with a session key (others are invalid)
+    session_vote_idx = np.fromiter(
+        (
+            i for i, (usuario_id, session_key, _, _) in enumerate(votes)
+            if not usuario_id and session_key
+        ),
+        dtype=np.int64,
+    )
+    session_keys = np.array(
+        [votes[i][1] for i in session_vote_idx], dtype=object
+    )
+
+    # Count votes per voter
+    is_user_vote = user_ids > 0
+    unique_users, user_counts = np.unique(
+        user_ids[is_user_vote], return_counts=True
+    )
+    if len(session_keys):
+        unique_sessions, session_inverse, session_counts = np.unique(
+            session_keys, return_inverse=True, return_counts=True
+        )
+    else:
+        unique_sessions = np.array([], dtype=object)
+        session_inverse = np.array([], dtype=np.int64)
+        session_counts = np.array([], dtype=np.int64)
 
     # Filter voters by minimum vote threshold
-    qualified_voters = {
-        voter_key
-        for voter_key, count in voter_vote_counts.items()
-        if count >= min_votes_per_voter
-    }
+    qualified_user_ids = unique_users[user_counts >= min_votes_per_voter]
+    is_qualified_session = session_counts >= min_votes_per_voter
+    n_voters_total = len(unique_users) + len(unique_sessions)
+    n_qualified = len(qualified_user_ids) + int(is_qualified_session.sum())
 
     logger.info(
-        f"Found {len(voter_vote_counts)} voters, "
-        f"{len(qualified_voters)} meet minimum {min_votes_per_voter} votes"
+        f"Found {n_voters_total} voters, "
+        f"{n_qualified} meet minimum {min_votes_per_voter} votes"
     )
 
-    if not qualified_voters:
+    if not n_qualified:
         logger.warning(
             f"No voters with at least {min_votes_per_voter} votes"
         )
-        return lil_matrix((0, 0)), [], []
-
-    # Assign indices to qualified voters
-    for i, voter_key in enumerate(sorted(qualified_voters)):
-        voter_id_map[voter_key] = i
-        voter_ids_list.append(voter_key)
-
-    # Build noticia index mapping
-    noticia_ids_set = {
-        vote['noticia_id']
-        for vote in votes
-        if (
-            (vote['usuario_id'] and ('user', str(vote['usuario_id'])) in qualified_voters) or
-            (vote['session_key'] and ('session', vote['session_key']) in qualified_voters)
+        return csr_matrix((0, 0), dtype=np.int8), [], []
+
+    # Assign indices to qualified voters: sessions first (sorted), then users
+    # sorted by id. Users are resolved with np.searchsorted on the sorted
+    # int64 array of qualified ids.
+    session_row_of_unique = np.cumsum(is_qualified_session) - 1
+    session_row_of_unique[~is_qualified_session] = -1
+    n_sessions = int(is_qualified_session.sum())
+
+    voter_ids_list = [
+        ('session', session_key)
+        for session_key in unique_sessions[is_qualified_session]
+    ]
+    voter_ids_list.extend(('user', str(user_id)) for user_id in qualified_user_ids)
+
+    # Resolve the row of every vote (-1 = voter not qualified or invalid)
+    rows = np.full(n_votes, -1, dtype=np.int64)
+
+    if len(qualified_user_ids):
+        user_pos = np.searchsorted(qualified_user_ids, user_ids)
+        user_pos_clipped = np.minimum(user_pos, len(qualified_user_ids) - 1)
+        is_qualified_user = (
+            is_user_vote & (qualified_user_ids[user_pos_clipped] == user_ids)
         )
-    }
-    noticia_ids_list = sorted(noticia_ids_set)
-    noticia_id_map = {nid: i for i, nid in enumerate(noticia_ids_list)}
+        rows[is_qualified_user] = n_sessions + user_pos[is_qualified_user]
+
+    if len(session_vote_idx):
+        rows[session_vote_idx] = session_row_of_unique[session_inverse]
+
+    # Build noticia index mapping from the votes of qualified voters
+    included = rows >= 0
+    noticia_ids_unique, cols = np.unique(
+        noticia_ids[included], return_inverse=True
+    )
+    noticia_ids_list = noticia_ids_unique.tolist()
+    rows = rows[included]
+    opinions = opinions[included]
 
-    # Initialize sparse matrix
+    # Build sparse matrix from (row, col, code) triplets in one step.
+    # Voto's unique constraints guarantee no duplicate (voter, noticia) pairs.
     n_voters = len(voter_ids_list)
     n_noticias = len(noticia_ids_list)
-    vote_matrix = lil_matrix((n_voters, n_noticias), dtype=np.float32)
-
-    # Opinion encoding: Use epsilon for neutral so it's stored in sparse matrix
-    # (scipy sparse doesn't store 0s, so we use 0.0001 and convert back to 0.0 later)
-    NEUTRAL_EPSILON = 0.0001
-    opinion_encoding = {
-        'buena': 1.0,
-        'neutral': NEUTRAL_EPSILON,
-        'mala': -1.0,
-    }
-
-    # Fill matrix
-    for vote in votes:
-        # Get voter key
-        if vote['usuario_id']:
-            voter_key = ('user', str(vote['usuario_id']))
-        elif vote['session_key']:
-            voter_key = ('session', vote['session_key'])
-        else:
-            continue
-
-        # Skip if voter not qualified
-        if voter_key not in voter_id_map:
-            continue
-
-        # Skip if noticia not in our set
-        if vote['noticia_id'] not in noticia_id_map:
-            continue
-
-        voter_idx = voter_id_map[voter_key]
-        noticia_idx = noticia_id_map[vote['noticia_id']]
-        opinion_value = opinion_encoding.get(vote['opinion'], NEUTRAL_EPSILON)
-
-        vote_matrix[voter_idx, noticia_idx] = opinion_value
+    vote_matrix = coo_matrix(
+        (opinions, (rows, cols)),
+        shape=(n_voters, n_noticias),
+        dtype=np.int8,
+    ).tocsr()
 
     # Log statistics
     density = vote_matrix.nnz / (n_voters * n_noticias) * 100
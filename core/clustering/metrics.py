@@ -11,13 +11,25 @@ References:
 See REFERENCES.md for detailed documentation.
 """
 
+import math
 import numpy as np
-from scipy.sparse import issparse
+from scipy.sparse import csr_matrix, issparse
 from sklearn.metrics import silhouette_score
 import logging
 
+from .matrix_builder import (
+    OPINION_CODES,
+    VOTE_BUENA,
+    VOTE_MALA,
+    VOTE_NEUTRAL,
+)
+
 logger = logging.getLogger(__name__)
 
+# Silhouette is O(N²) in pairwise distances; above this many voters it is
+# estimated on a fixed-seed random sample instead.
+SILHOUETTE_SAMPLE_SIZE = 2000
+
 
 def compute_cluster_consensus(cluster_votes):
     """
@@ -28,40 +40,63 @@ def compute_cluster_consensus(cluster_votes):
 
     Args:
         cluster_votes: dict {noticia_id: {'buena': count, 'mala': count, 'neutral': count}}
+                       or an array (N_noticias × 3) of [buena, mala, neutral]
+                       counts
 
     Returns:
         float: consensus score (0-1)
             0 = complete disagreement
             1 = complete agreement
     """
-    if not cluster_votes:
-        return 0.0
-
-    consensus_scores = []
-
-    for noticia_id, vote_counts in cluster_votes.items():
-        # Ignore precomputed totals to avoid double-counting.
-        total = sum(
-            value for key, value in vote_counts.items()
-            if key != "total"
+    if isinstance(cluster_votes, dict):
+        if not cluster_votes:
+            return 0.0
+        # Precomputed totals are ignored to avoid double-counting
+        counts = np.array(
+            [
+                (
+                    vote_counts.get('buena', 0),
+                    vote_counts.get('mala', 0),
+                    vote_counts.get('neutral', 0),
+                )
+                for vote_counts in cluster_votes.values()
+            ],
+            dtype=np.int64,
         )
-        if total == 0:
-            continue
-
-        # Consensus = (max_count / total)
-        # When everyone agrees, max_count = total, consensus = 1
-        max_count = max(
-            value for key, value in vote_counts.items()
-            if key != "total"
-        )
-        consensus = max_count / total
-        consensus_scores.append(consensus)
+    else:
+        counts = np.asarray(cluster_votes).reshape(-1, 3)
 
-    if not consensus_scores:
+    # Consensus = (max_count / total) per article, skipping unvoted ones
+    # When everyone agrees, max_count = total, consensus = 1
+    totals = counts.sum(axis=1)
+    voted = totals > 0
+    if not voted.any():
         return 0.0
 
     # Average consensus across all articles
-    return np.mean(consensus_scores)
+    return np.mean(counts[voted].max(axis=1) / totals[voted])
+
+
+def voter_votes_to_arrays(voter_votes):
+    """
+    Convert a voter's votes to the sorted-array form used for similarity.
+
+    Args:
+        voter_votes: dict {noticia_id: opinion}
+
+    Returns:
+        tuple: (noticia_ids, opinions)
+            - noticia_ids: sorted int64 array of noticia IDs
+            - opinions: int8 array of opinion codes aligned with noticia_ids
+    """
+    noticia_ids = np.fromiter(voter_votes.keys(), dtype=np.int64, count=len(voter_votes))
+    opinions = np.fromiter(
+        (OPINION_CODES.get(op, 0) for op in voter_votes.values()),
+        dtype=np.int8,
+        count=len(voter_votes),
+    )
+    order = np.argsort(noticia_ids)
+    return noticia_ids[order], opinions[order]
 
 
 def compute_voter_similarity(voter_a_votes, voter_b_votes):
@@ -71,8 +106,8 @@ def compute_voter_similarity(voter_a_votes, voter_b_votes):
     Similarity = (number of agreements) / (number of co-voted articles)
 
     Args:
-        voter_a_votes: dict {noticia_id: opinion}
-        voter_b_votes: dict {noticia_id: opinion}
+        voter_a_votes: tuple (noticia_ids, opinions) from voter_votes_to_arrays()
+        voter_b_votes: tuple (noticia_ids, opinions) from voter_votes_to_arrays()
 
     Returns:
         float: similarity (0-1)
@@ -80,29 +115,39 @@ def compute_voter_similarity(voter_a_votes, voter_b_votes):
             1 = complete agreement
             None = no co-voted articles
     """
-    # Find co-voted articles
-    co_voted = set(voter_a_votes.keys()) & set(voter_b_votes.keys())
-
-    if not co_voted:
-        return None
+    ids_a, opinions_a = voter_a_votes
+    ids_b, opinions_b = voter_b_votes
 
-    # Count agreements
-    agreements = sum(
-        1 for nid in co_voted
-        if voter_a_votes[nid] == voter_b_votes[nid]
+    # Find co-voted articles (both id arrays are sorted and unique)
+    _, idx_a, idx_b = np.intersect1d(
+        ids_a, ids_b, assume_unique=True, return_indices=True
     )
 
-    similarity = agreements / len(co_voted)
-    return similarity
+    if len(idx_a) == 0:
+        return None
+
+    # Fraction of co-voted articles where both opinions match
+    return float(np.mean(opinions_a[idx_a] == opinions_b[idx_b]))
 
 
-def compute_silhouette_score(projections, labels):
+def compute_silhouette_score(
+    projections,
+    labels,
+    sample_size=SILHOUETTE_SAMPLE_SIZE
+):
     """
     Compute silhouette score for clustering quality.
 
+    For more than sample_size voters the score is computed on a random
+    sample (fixed seed, so runs are reproducible). The score is a mean of
+    per-voter values in [-1, 1], so the sampling error shrinks as
+    1/sqrt(sample_size): about ±0.02 at the default size.
+
     Args:
         projections: numpy array (N_voters × 2)
         labels: cluster assignments (N_voters,)
+        sample_size: max voters used for the estimate (default
+            SILHOUETTE_SAMPLE_SIZE); None uses every voter
 
     Returns:
         float: silhouette score (-1 to 1)
@@ -124,7 +169,16 @@ def compute_silhouette_score(projections, labels):
         return 0.0
 
     try:
-        score = silhouette_score(projections, labels)
+        score = silhouette_score(
+            projections,
+            labels,
+            metric='euclidean',
+            sample_size=(
+                None if sample_size is None
+                else min(sample_size, len(labels))
+            ),
+            random_state=42,
+        )
         return score
     except Exception as e:
         logger.error(f"Error computing silhouette score: {e}")
@@ -146,7 +200,8 @@ def compute_cluster_voting_aggregation(
     Args:
         cluster_members: array of voter indices in this cluster
         voter_ids_list: list of (voter_type, voter_id) tuples
-        vote_matrix: sparse matrix (N_voters × N_noticias)
+        vote_matrix: CSR (or CSC) sparse matrix (N_voters × N_noticias) of
+                     opinion codes, or a dense array
         noticia_ids_list: list of noticia IDs
 
     Returns:
@@ -161,15 +216,18 @@ def compute_cluster_voting_aggregation(
     """
     aggregation = {}
 
-    if issparse(vote_matrix):
-        # Convert to CSR for efficient row/column access
-        vote_matrix_csr = vote_matrix.tocsr()
-    else:
-        vote_matrix_csr = vote_matrix
+    # The matrix is shared across every cluster of a run, so it must already
+    # be in a compressed format: converting here would repeat an O(nnz) copy
+    # once per cluster.
+    if issparse(vote_matrix) and vote_matrix.format not in ('csr', 'csc'):
+        raise ValueError(
+            f"vote_matrix must be CSR or CSC (as returned by "
+            f"build_vote_matrix), got {vote_matrix.format}"
+        )
+    vote_matrix_csr = vote_matrix
 
-    NEUTRAL_EPSILON = 0.0001  # See matrix_builder.py
-    
     # Debug: log if cluster_members are out of bounds
+    cluster_members = np.asarray(cluster_members, dtype=np.intp)
     if len(cluster_members) > 0:
         max_member_idx = np.max(cluster_members)
         if max_member_idx >= vote_matrix.shape[0]:
@@ -177,72 +235,43 @@ def compute_cluster_voting_aggregation(
                 f"Cluster member index {max_member_idx} out of bounds "
                 f"(matrix has {vote_matrix.shape[0]} rows)"
             )
-    
-    # Debug: log aggregation stats
-    total_votes_found = 0
-    noticias_with_votes = 0
-    
-    # Debug: Check a sample noticia to see what's happening
-    sample_checked = False
-    
-    for noticia_idx, noticia_id in enumerate(noticia_ids_list):
-        if issparse(vote_matrix):
-            column = vote_matrix_csr[:, noticia_idx]
-            # For CSR column vector, use nonzero() to get row indices
-            # column.indices gives column indices (always [0] for column vector), not row indices
-            if hasattr(column, 'nonzero'):
-                row_indices_with_votes, _ = column.nonzero()
-                row_indices_with_votes = row_indices_with_votes.tolist()
-            else:
-                row_indices_with_votes = []
-            data_values = column.data if hasattr(column, 'data') else []
-            vote_map = dict(zip(row_indices_with_votes, data_values))
-            
-            # Debug: Log first noticia with votes to understand the issue
-            if not sample_checked and len(row_indices_with_votes) > 0:
-                cluster_members_in_column = [v for v in cluster_members if v in vote_map]
-                if len(cluster_members_in_column) > 0:
-                    logger.warning(
-                        f"DEBUG: Noticia {noticia_id} (idx {noticia_idx}) has {len(row_indices_with_votes)} total votes, "
-                        f"{len(cluster_members_in_column)} from cluster members"
-                    )
-                    sample_checked = True
-            
-            cluster_votes = []
-            for voter_idx in cluster_members:
-                # Validate index bounds
-                if voter_idx >= vote_matrix.shape[0]:
-                    logger.warning(
-                        f"Voter index {voter_idx} out of bounds for noticia {noticia_id}"
-                    )
-                    continue
-                if voter_idx in vote_map:
-                    vote_value = float(vote_map[voter_idx])
-                    if abs(vote_value - NEUTRAL_EPSILON) < 1e-6:
-                        vote_value = 0.0  # Convert epsilon back to 0 for neutral
-                    cluster_votes.append(vote_value)
-            
-            votes_array = np.array(cluster_votes) if cluster_votes else np.array([])
-        else:
-            votes_array = vote_matrix_csr[cluster_members, noticia_idx]
-            votes_array = np.where(np.abs(votes_array - NEUTRAL_EPSILON) < 1e-6, 0.0, votes_array)
-
-        # Count by opinion
-        buena_count = np.sum(votes_array == 1)
-        mala_count = np.sum(votes_array == -1)
-        neutral_count = np.sum(votes_array == 0)
-
-        total = buena_count + mala_count + neutral_count
-
-        if total > 0:
-            aggregation[noticia_id] = {
-                'buena': int(buena_count),
-                'mala': int(mala_count),
-                'neutral': int(neutral_count),
-                'total': int(total)
-            }
-            total_votes_found += total
-            noticias_with_votes += 1
+            cluster_members = cluster_members[
+                cluster_members < vote_matrix.shape[0]
+            ]
+
+    # Count by opinion code (missing votes are 0 and never counted)
+    n_noticias = len(noticia_ids_list)
+    cluster_votes = vote_matrix_csr[cluster_members]
+    if issparse(cluster_votes):
+        # Stay sparse: bin the cluster's stored votes by column index
+        cluster_votes = cluster_votes.tocsr()
+        codes = cluster_votes.data
+        columns = cluster_votes.indices
+        buena_counts = np.bincount(
+            columns[codes == VOTE_BUENA], minlength=n_noticias
+        )
+        mala_counts = np.bincount(
+            columns[codes == VOTE_MALA], minlength=n_noticias
+        )
+        neutral_counts = np.bincount(
+            columns[codes == VOTE_NEUTRAL], minlength=n_noticias
+        )
+    else:
+        buena_counts = np.count_nonzero(cluster_votes == VOTE_BUENA, axis=0)
+        mala_counts = np.count_nonzero(cluster_votes == VOTE_MALA, axis=0)
+        neutral_counts = np.count_nonzero(
+            cluster_votes == VOTE_NEUTRAL, axis=0
+        )
+    totals = buena_counts + mala_counts + neutral_counts
+
+    for noticia_idx in np.flatnonzero(totals):
+        aggregation[noticia_ids_list[noticia_idx]] = {
+            'buena': int(buena_counts[noticia_idx]),
+            'mala': int(mala_counts[noticia_idx]),
+            'neutral': int(neutral_counts[noticia_idx]),
+            'total': int(totals[noticia_idx])
+        }
+    noticias_with_votes = len(aggregation)
 
     # Debug logging
     if len(cluster_members) > 0 and noticias_with_votes == 0:
@@ -255,6 +284,76 @@ def compute_cluster_voting_aggregation(
     return aggregation
 
 
+def compute_all_cluster_aggregations(labels, vote_matrix, noticia_ids_list):
+    """
+    Aggregate voting patterns for every cluster in one pass.
+
+    Equivalent to calling compute_cluster_voting_aggregation() once per
+    cluster, but streams the stored votes of the matrix a single time and
+    bins them by (cluster, noticia, opinion).
+
+    Args:
+        labels: cluster assignment per voter row (N_voters,)
+        vote_matrix: sparse matrix (N_voters × N_noticias) of opinion codes
+        noticia_ids_list: list of noticia IDs
+
+    Returns:
+        dict: {
+            cluster_label: {
+                noticia_id: {
+                    'buena': count,
+                    'mala': count,
+                    'neutral': count,
+                    'total': count
+                }
+            }
+        }
+    """
+    labels = np.asarray(labels)
+    vote_matrix_csr = vote_matrix.tocsr() if issparse(vote_matrix) else csr_matrix(vote_matrix)
+    n_noticias = vote_matrix_csr.shape[1]
+
+    cluster_labels, cluster_of_row = np.unique(labels, return_inverse=True)
+    n_clusters = len(cluster_labels)
+
+    # Row of every stored vote, then the cluster that row belongs to
+    vote_rows = np.repeat(
+        np.arange(vote_matrix_csr.shape[0]), np.diff(vote_matrix_csr.indptr)
+    )
+    vote_clusters = cluster_of_row[vote_rows]
+
+    # Opinion bin per stored vote: 0=buena, 1=mala, 2=neutral
+    data = vote_matrix_csr.data
+    opinion_bins = np.full(len(data), -1, dtype=np.int64)
+    opinion_bins[data == VOTE_BUENA] = 0
+    opinion_bins[data == VOTE_MALA] = 1
+    opinion_bins[data == VOTE_NEUTRAL] = 2
+    valid = opinion_bins >= 0
+
+    flat_index = (
+        vote_clusters[valid] * n_noticias + vote_matrix_csr.indices[valid]
+    ) * 3 + opinion_bins[valid]
+    counts = np.bincount(
+        flat_index, minlength=n_clusters * n_noticias * 3
+    ).reshape(n_clusters, n_noticias, 3)
+
+    aggregations = {}
+    for c, cluster_label in enumerate(cluster_labels):
+        cluster_counts = counts[c]
+        totals = cluster_counts.sum(axis=1)
+        aggregations[cluster_label.item()] = {
+            noticia_ids_list[j]: {
+                'buena': int(cluster_counts[j, 0]),
+                'mala': int(cluster_counts[j, 1]),
+                'neutral': int(cluster_counts[j, 2]),
+                'total': int(totals[j]),
+            }
+            for j in np.flatnonzero(totals)
+        }
+
+    return aggregations
+
+
 def compute_distance_to_centroid(projection, centroid):
     """
     Compute Euclidean distance from voter to cluster centroid.
@@ -266,7 +365,24 @@ def compute_distance_to_centroid(projection, centroid):
     Returns:
         float: distance
     """
-    return np.linalg.norm(projection - centroid)
+    return math.hypot(projection[0] - centroid[0], projection[1] - centroid[1])
+
+
+def compute_distances_to_centroids(projections, centroids, labels):
+    """
+    Compute Euclidean distance from every voter to its cluster centroid.
+
+    Vectorized form of compute_distance_to_centroid() for a whole run.
+
+    Args:
+        projections: numpy array (N_voters × 2), voters' 2D coordinates
+        centroids: numpy array (k × 2), indexed by cluster label
+        labels: cluster assignment per voter (N_voters,)
+
+    Returns:
+        numpy array (N_voters,) of distances
+    """
+    return np.linalg.norm(projections - centroids[labels], axis=1)
 
 
 def compute_cluster_entities(cluster, top_n=5):
@@ -289,12 +405,18 @@ def compute_cluster_entities(cluster, top_n=5):
 
     # Get noticias where cluster voted with consensus
     patterns = cluster.voting_patterns.filter(
-        consensus_score__gte=0.6
-    ).select_related('noticia')
+        consensus_score__gte=0.6,
+        majority_opinion__in=['buena', 'mala'],
+    ).values_list('noticia_id', 'majority_opinion')
 
     # Separate by majority opinion
-    noticias_buena = [p.noticia_id for p in patterns if p.majority_opinion == 'buena']
-    noticias_mala = [p.noticia_id for p in patterns if p.majority_opinion == 'mala']
+    noticias_buena = set()
+    noticias_mala = set()
+    for noticia_id, majority_opinion in patterns:
+        if majority_opinion == 'buena':
+            noticias_buena.add(noticia_id)
+        else:
+            noticias_mala.add(noticia_id)
 
     # For noticias voted "buena": entities with positive sentiment are "liked"
     # For noticias voted "mala": entities with negative sentiment are "disliked"
@@ -304,27 +426,27 @@ def compute_cluster_entities(cluster, top_n=5):
     # Track entity info by (nombre, tipo) key
     entity_info = {}
 
-    # Entities from positively-voted noticias
-    if noticias_buena:
-        positive_nes = NoticiaEntidad.objects.filter(
-            noticia_id__in=noticias_buena,
-            sentimiento='positivo'
-        ).select_related('entidad')
-        for ne in positive_nes:
-            key = (ne.entidad.nombre, ne.entidad.tipo)
-            entities_positive[key] += 1
-            entity_info[key] = ne.entidad.id
-
-    # Entities from negatively-voted noticias
-    if noticias_mala:
-        negative_nes = NoticiaEntidad.objects.filter(
-            noticia_id__in=noticias_mala,
-            sentimiento='negativo'
-        ).select_related('entidad')
-        for ne in negative_nes:
-            key = (ne.entidad.nombre, ne.entidad.tipo)
-            entities_negative[key] += 1
-            entity_info[key] = ne.entidad.id
+    # One query for both sentiments; rows are routed by the noticia's opinion
+    if noticias_buena or noticias_mala:
+        rows = NoticiaEntidad.objects.filter(
+            noticia_id__in=noticias_buena | noticias_mala,
+            sentimiento__in=['positivo', 'negativo'],
+        ).values_list(
+            'noticia_id',
+            'entidad_id',
+            'entidad__nombre',
+            'entidad__tipo',
+            'sentimiento',
+        )
+        for noticia_id, entidad_id, nombre, tipo, sentimiento in rows:
+            key = (nombre, tipo)
+            if sentimiento == 'positivo' and noticia_id in noticias_buena:
+                entities_positive[key] += 1
+            elif sentimiento == 'negativo' and noticia_id in noticias_mala:
+                entities_negative[key] += 1
+            else:
+                continue
+            entity_info[key] = entidad_id
 
     # Format results with id for linking
     top_positive = [
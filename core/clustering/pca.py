@@ -20,19 +20,32 @@ See REFERENCES.md for detailed documentation.
 """
 
 import numpy as np
-from scipy.sparse import issparse
-from scipy.linalg import svd
+from scipy.sparse import csr_matrix
+from scipy.sparse.linalg import LinearOperator, svds
+from sklearn.utils.extmath import randomized_svd, svd_flip
 import logging
 
+from .matrix_builder import opinion_values
+
 logger = logging.getLogger(__name__)
 
+# Decimals kept when projections are sent to the biplot. Projections are
+# scaled by sqrt(n_noticias / votes) (see below), so they span whole units
+# or more; an absolute error of 1e-3 is far below one pixel of the chart.
+PROJECTION_DECIMALS = 3
+
+
+def quantize_projection(value):
+    """Round a stored projection coordinate for JSON payloads."""
+    return round(value, PROJECTION_DECIMALS)
+
 
 def compute_sparsity_aware_pca(vote_matrix, n_components=2):
     """
     Compute PCA with sparsity-aware projection scaling using SVD.
 
-    Uses SVD decomposition V = U @ S @ Vt to project both voters and
-    noticias into the same space (biplot):
+    Uses a truncated (randomized) SVD V ~= U @ S @ Vt to project both
+    voters and noticias into the same space (biplot):
     - Voters: U[:, :k] @ diag(S[:k])
     - Noticias: Vt[:k, :].T @ diag(S[:k])
 
@@ -44,7 +57,8 @@ def compute_sparsity_aware_pca(vote_matrix, n_components=2):
 
     Args:
         vote_matrix: scipy.sparse matrix (N_voters x N_noticias)
-                     Values: +1 (buena), 0 (neutral), -1 (mala), NULL (sparse)
+                     Opinion codes from build_vote_matrix (see OPINION_CODES):
+                     2 (buena), 1 (neutral), -2 (mala), NULL (sparse)
         n_components: int, number of components (default 2 for visualization)
 
     Returns:
@@ -54,7 +68,7 @@ def compute_sparsity_aware_pca(vote_matrix, n_components=2):
             - variance_explained: array of variance ratios
             - voter_vote_counts: votes cast per voter
             - noticia_vote_counts: votes received per noticia
-            - singular_values: S from SVD
+            - singular_values: top n_components singular values
     """
     n_voters, n_noticias = vote_matrix.shape
 
@@ -68,80 +82,92 @@ def compute_sparsity_aware_pca(vote_matrix, n_components=2):
         f"{n_components} components"
     )
 
-    # Epsilon value used for neutral votes in sparse matrix (see matrix_builder.py)
-    NEUTRAL_EPSILON = 0.0001
-    
-    # Convert to dense for SVD
-    if issparse(vote_matrix):
-        vote_matrix_dense = vote_matrix.toarray()
-    else:
-        vote_matrix_dense = np.array(vote_matrix)
-    
-    # Convert epsilon back to 0 for neutral votes (for proper mean-centering)
-    vote_matrix_dense = np.where(
-        np.abs(vote_matrix_dense - NEUTRAL_EPSILON) < 1e-6, 
-        0.0, 
-        vote_matrix_dense
+    # Keep the matrix sparse: stored entries are exactly the votes cast
+    vote_codes_csr = csr_matrix(vote_matrix)
+
+    # Map opinion codes to values (neutral -> 0 for proper mean-centering).
+    # Values are in {-1, 0, 1}, so float32 is plenty for a 2D projection and
+    # halves the memory traffic of the SVD
+    vote_values = csr_matrix(
+        (
+            opinion_values(vote_codes_csr.data).astype(np.float32),
+            vote_codes_csr.indices,
+            vote_codes_csr.indptr,
+        ),
+        shape=vote_codes_csr.shape,
     )
 
     # Count votes per voter/noticia (count entries present in sparse matrix)
-    if issparse(vote_matrix):
-        vote_matrix_for_counting = vote_matrix.toarray()
-        # Count non-zero entries OR epsilon (before conversion)
-        voter_vote_counts = np.array([
-            np.sum((np.abs(vote_matrix_for_counting[i, :]) > 1e-10) | 
-                   (np.abs(vote_matrix_for_counting[i, :] - NEUTRAL_EPSILON) < 1e-6))
-            for i in range(n_voters)
-        ])
-        noticia_vote_counts = np.array([
-            np.sum((np.abs(vote_matrix_for_counting[:, j]) > 1e-10) | 
-                   (np.abs(vote_matrix_for_counting[:, j] - NEUTRAL_EPSILON) < 1e-6))
-            for j in range(n_noticias)
-        ])
-    else:
-        voter_vote_counts = np.array([
-            np.count_nonzero(vote_matrix_dense[i, :])
-            for i in range(n_voters)
-        ])
-        noticia_vote_counts = np.array([
-            np.count_nonzero(vote_matrix_dense[:, j])
-            for j in range(n_noticias)
-        ])
-    
-    voter_vote_counts = np.maximum(voter_vote_counts, 1)
-    noticia_vote_counts = np.maximum(noticia_vote_counts, 1)
-
-    # Mean-center the matrix (standard PCA preprocessing)
-    # Use the converted matrix where epsilon -> 0
-    matrix_centered = vote_matrix_dense - vote_matrix_dense.mean(axis=0)
-
-    # SVD decomposition: V = U @ S @ Vt
-    U, S, Vt = svd(matrix_centered, full_matrices=False)
-
-    # Compute variance explained
-    total_variance = np.sum(S ** 2)
-    variance_explained = (S[:n_components] ** 2) / total_variance
-
-    # Extract top k components
-    S_k = S[:n_components]
-
-    # Voter projections: U[:, :k] @ diag(S[:k])
-    voter_projections = U[:, :n_components] @ np.diag(S_k)
+    # Every stored code is a vote, including neutral; build_vote_matrix
+    # never stores a zero code, so stored == voted
+    voter_vote_counts = vote_codes_csr.getnnz(axis=1)
+    noticia_vote_counts = vote_codes_csr.getnnz(axis=0)
 
-    # Noticia projections: Vt[:k, :].T @ diag(S[:k])
-    # This places noticias in the same space as voters
-    noticia_projections = Vt[:n_components, :].T @ np.diag(S_k)
+    np.maximum(voter_vote_counts, 1, out=voter_vote_counts)
+    np.maximum(noticia_vote_counts, 1, out=noticia_vote_counts)
+
+    # Mean-center the matrix (standard PCA preprocessing). Centering is
+    # applied implicitly as a rank-1 correction so the dense centered
+    # matrix is never built: (A - 1 mu^T) x = A x - (mu . x) 1
+    column_means = np.asarray(vote_values.mean(axis=0)).ravel()
+
+    def centered_matmat(x):
+        return vote_values @ x - column_means @ x
 
-    # Sparsity-aware scaling for voters (Polis approach)
-    voter_scaling = np.sqrt(n_noticias / voter_vote_counts)
-    voter_projections_scaled = voter_projections * voter_scaling[:, np.newaxis]
+    def centered_rmatmat(y):
+        return vote_values.T @ y - np.multiply.outer(
+            column_means, y.sum(axis=0)
+        )
 
-    # Sparsity-aware scaling for noticias (same logic)
-    noticia_scaling = np.sqrt(n_voters / noticia_vote_counts)
-    noticia_projections_scaled = (
-        noticia_projections * noticia_scaling[:, np.newaxis]
+    matrix_centered = LinearOperator(
+        (n_voters, n_noticias),
+        matvec=centered_matmat,
+        rmatvec=centered_rmatmat,
+        matmat=centered_matmat,
+        rmatmat=centered_rmatmat,
+        dtype=np.float32,
     )
 
+    # Truncated SVD: V ~= U @ S @ Vt, only the top k components are needed
+    if n_components < min(n_voters, n_noticias):
+        # Fixed starting vector keeps ARPACK deterministic across runs
+        v0 = np.random.default_rng(0).uniform(
+            -1, 1, min(n_voters, n_noticias)
+        ).astype(np.float32)
+        U, S_k, Vt = svds(matrix_centered, k=n_components, v0=v0)
+        # svds returns singular values in ascending order
+        U, S_k, Vt = U[:, ::-1], S_k[::-1], Vt[::-1]
+        U, Vt = svd_flip(U, Vt)
+    else:
+        # svds needs k < min(N, M); tiny matrices are cheap to densify
+        U, S_k, Vt = randomized_svd(
+            vote_values.toarray() - column_means,
+            n_components=n_components,
+            n_oversamples=10,
+            n_iter=4,
+            random_state=0,
+        )
+
+    # Compute variance explained (total variance over all components,
+    # not just the truncated ones): ||A - 1 mu^T||^2 = ||A||^2 - N ||mu||^2
+    total_variance = (
+        np.sum(np.square(vote_values.data, dtype=np.float64))
+        - n_voters * np.sum(np.square(column_means, dtype=np.float64))
+    )
+    variance_explained = (S_k ** 2) / total_variance
+
+    # Voter projections: U[:, :k] @ diag(S[:k]), with the sparsity-aware
+    # scaling (Polis approach) applied in place on the same buffer
+    voter_scaling = np.sqrt(n_noticias) / np.sqrt(voter_vote_counts)
+    voter_projections_scaled = np.multiply(U, S_k, dtype=np.float64)
+    voter_projections_scaled *= voter_scaling[:, np.newaxis]
+
+    # Noticia projections: Vt[:k, :].T @ diag(S[:k])
+    # This places noticias in the same space as voters (same scaling logic)
+    noticia_scaling = np.sqrt(n_voters) / np.sqrt(noticia_vote_counts)
+    noticia_projections_scaled = np.multiply(Vt.T, S_k, dtype=np.float64)
+    noticia_projections_scaled *= noticia_scaling[:, np.newaxis]
+
     logger.info(
         f"SVD complete: variance explained = {variance_explained}"
     )
@@ -166,5 +192,5 @@ def compute_sparsity_aware_pca(vote_matrix, n_components=2):
         'variance_explained': variance_explained,
         'voter_vote_counts': voter_vote_counts,
         'noticia_vote_counts': noticia_vote_counts,
-        'singular_values': S,
+        'singular_values': S_k,
     }
@@ -34,3 +34,17 @@ def authenticated_client(user):
     client = Client()
     client.login(username='testuser', password='testpassword123')
     return client
+
+@pytest.fixture
+def locmem_cache(settings):
+    """Use an isolated in-memory cache instead of Redis for the test."""
+    from django.core.cache import cache
+
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'tests',
+        }
+    }
+    cache.clear()
+    return cache
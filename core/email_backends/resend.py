@@ -24,6 +24,29 @@ class ResendEmailBackend(BaseEmailBackend):
         self.api_url = getattr(
             settings, "RESEND_API_URL", "https://api.resend.com/emails"
         )
+        self.session: requests.Session | None = None
+
+    def open(self) -> bool:
+        """Open a keep-alive HTTP session, reused for every message sent."""
+        if self.session is not None:
+            return False
+
+        self.session = requests.Session()
+        self.session.headers.update(
+            {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+            }
+        )
+        return True
+
+    def close(self) -> None:
+        if self.session is None:
+            return
+        try:
+            self.session.close()
+        finally:
+            self.session = None
 
     def send_messages(self, email_messages: Iterable[EmailMessage] | None) -> int:
         if not email_messages:
@@ -36,26 +59,26 @@ class ResendEmailBackend(BaseEmailBackend):
                 return 0
             raise ValueError(message)
 
+        new_session_created = self.open()
         sent_count = 0
-        for message in email_messages:
-            try:
-                self._send(message)
-                sent_count += 1
-            except Exception:
-                logger.exception("Failed to send email via Resend")
-                if not self.fail_silently:
-                    raise
+        try:
+            for message in email_messages:
+                try:
+                    self._send(message)
+                    sent_count += 1
+                except Exception:
+                    logger.exception("Failed to send email via Resend")
+                    if not self.fail_silently:
+                        raise
+        finally:
+            if new_session_created:
+                self.close()
 
         return sent_count
 
     def _send(self, message: EmailMessage) -> None:
         payload = self._build_payload(message)
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
-
-        response = requests.post(self.api_url, json=payload, headers=headers, timeout=10)
+        response = self.session.post(self.api_url, json=payload, timeout=10)
         response.raise_for_status()
 
     def _build_payload(self, message: EmailMessage) -> dict:
@@ -89,10 +112,14 @@ class ResendEmailBackend(BaseEmailBackend):
 
     @staticmethod
     def _get_html_body(message: EmailMessage) -> str | None:
-        for content, mime in getattr(message, "alternatives", []):
-            if mime == "text/html":
-                return content
-        return None
+        return next(
+            (
+                content
+                for content, mime in getattr(message, "alternatives", None) or ()
+                if mime == "text/html"
+            ),
+            None,
+        )
 
     @staticmethod
     def _serialize_attachments(attachments: List) -> list:
@@ -115,9 +142,10 @@ class ResendEmailBackend(BaseEmailBackend):
                     continue
 
             if isinstance(content, str):
-                content = content.encode()
+                content = content.encode("utf-8")
 
-            encoded_content = base64.b64encode(content).decode()
+            # Base64 output is pure ASCII; memoryview avoids copying buffers
+            encoded_content = base64.b64encode(memoryview(content)).decode("ascii")
             serialized.append(
                 {
                     "filename": filename,
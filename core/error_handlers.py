@@ -2,9 +2,11 @@
 Custom error handlers for Django.
 Generates pre-filled GitHub issue links for error reporting.
 """
+import sys
 import traceback
 import logging
-from urllib.parse import quote
+from functools import lru_cache
+from urllib.parse import quote, quote_from_bytes
 from django.shortcuts import render
 from django.conf import settings
 from django.http import JsonResponse
@@ -13,6 +15,15 @@ import uuid
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=8)
+def _github_issue_url_prefix(repo, labels):
+    """Static part of the issue URL; only title and body vary per error."""
+    prefix = f"https://github.com/{repo}/issues/new?"
+    if labels:
+        prefix += f"labels={quote(','.join(labels))}&"
+    return prefix
+
+
 def get_github_issue_url(
     title, body, labels=None, repo="raulsperoni/memoria.uy"
 ):
@@ -28,16 +39,11 @@ def get_github_issue_url(
     Returns:
         Full GitHub URL with query parameters
     """
-    base_url = f"https://github.com/{repo}/issues/new"
-    params = [
-        f"title={quote(title)}",
-        f"body={quote(body)}",
-    ]
-
-    if labels:
-        params.append(f"labels={quote(','.join(labels))}")
-
-    return f"{base_url}?{'&'.join(params)}"
+    prefix = _github_issue_url_prefix(repo, tuple(labels) if labels else ())
+    return (
+        f"{prefix}title={quote_from_bytes(title.encode('utf-8'))}"
+        f"&body={quote_from_bytes(body.encode('utf-8'))}"
+    )
 
 
 def ratelimited_error(request, exception):
@@ -88,8 +94,6 @@ def server_error(request, *args, **kwargs):
         # Get exception info if available
         exc_type, exc_value, exc_traceback = None, None, None
         if hasattr(request, "resolver_match"):
-            import sys
-
             exc_type, exc_value, exc_traceback = sys.exc_info()
 
         # Log the error
@@ -109,6 +113,11 @@ def server_error(request, *args, **kwargs):
             },
         )
 
+        # Format the traceback once (DEBUG only); reused in both outputs
+        tb_lines = None
+        if exc_traceback and settings.DEBUG:
+            tb_lines = traceback.format_tb(exc_traceback)
+
         # Generate GitHub issue content
         title = f"[BUG] Error 500 en {request.path}"
         body_parts = [
@@ -136,8 +145,7 @@ def server_error(request, *args, **kwargs):
                 ]
             )
 
-            if exc_traceback and settings.DEBUG:
-                tb_lines = traceback.format_tb(exc_traceback)
+            if tb_lines:
                 body_parts.extend(
                     [
                         "**Stack Trace:**",
@@ -161,8 +169,8 @@ def server_error(request, *args, **kwargs):
                 "",
                 "Traceback:",
             ]
-            if exc_traceback:
-                debug_parts.extend(traceback.format_tb(exc_traceback))
+            if tb_lines:
+                debug_parts.extend(tb_lines)
             debug_info = "\n".join(debug_parts)
 
         context = {
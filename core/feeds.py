@@ -8,7 +8,8 @@ and returns filtered queryset or noticia IDs. No request object dependency.
 import logging
 from typing import Optional
 
-from django.db.models import Q, QuerySet
+from django.core.cache import cache
+from django.db.models import QuerySet
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,70 @@ COMFORT_CLUSTER_CONSENSUS_MIN = 0.6
 PUENTE_CONSENSUS_THRESHOLD = 0.7
 PUENTE_MIN_VOTES_PER_CLUSTER = 3
 PUENTE_TOP_N = 500
+VOTED_IDS_CHUNK_SIZE = 10000
+
+# Latest completed clustering run, shared by every feed render. Cleared by
+# update_voter_clusters when a new run completes.
+LATEST_CLUSTER_RUN_CACHE_KEY = "voter_cluster_run:latest"
+LATEST_CLUSTER_RUN_CACHE_TIMEOUT = 300
+# Cached in place of a run when none has completed. A plain string so it
+# survives pickling through the cache backend.
+NO_CLUSTER_RUN = "none"
+
+# (voter_type, voter_id) pairs of a cluster. Clusters are immutable once their
+# run completes (a rerun creates new ids), so entries never go stale.
+CLUSTER_MEMBERS_CACHE_KEY = "voter_cluster_members:{cluster_id}"
+CLUSTER_MEMBERS_CACHE_TIMEOUT = 300
+
+# Full consensus order of a run for the bridge feed, keyed by run and
+# thresholds and warmed after each clustering run. The order is computed from
+# live votes, so it lags new votes by up to the timeout.
+PUENTE_CONSENSUS_CACHE_KEY = "puente_consensus:{run_id}:{threshold}:{min_votes}"
+PUENTE_CONSENSUS_CACHE_TIMEOUT = 3600
+
+
+def get_cluster_member_keys(cluster) -> list:
+    """
+    (voter_type, voter_id) of every member of cluster, cached per cluster.
+
+    Shared by every voter in the same cluster, so the member list is read
+    once per cluster instead of once per feed render.
+    """
+    return cache.get_or_set(
+        CLUSTER_MEMBERS_CACHE_KEY.format(cluster_id=cluster.id),
+        lambda: list(cluster.members.values_list("voter_type", "voter_id")),
+        timeout=CLUSTER_MEMBERS_CACHE_TIMEOUT,
+    )
+
+
+def get_latest_cluster_run():
+    """
+    Latest completed VoterClusterRun, cached for LATEST_CLUSTER_RUN_CACHE_TIMEOUT.
+
+    Returns:
+        VoterClusterRun or None if no run has completed yet. Absence is cached
+        too (as NO_CLUSTER_RUN); update_voter_clusters clears the key when a
+        run completes, so the first run is still picked up immediately.
+    """
+    from core.models import VoterClusterRun
+
+    cluster_run = cache.get(LATEST_CLUSTER_RUN_CACHE_KEY)
+    if cluster_run is None:
+        # Feeds only need the run's id (created_at for ordering/display)
+        cluster_run = (
+            VoterClusterRun.objects.filter(status="completed")
+            .only("id", "created_at")
+            .order_by("-created_at")
+            .first()
+        )
+        cache.set(
+            LATEST_CLUSTER_RUN_CACHE_KEY,
+            NO_CLUSTER_RUN if cluster_run is None else cluster_run,
+            LATEST_CLUSTER_RUN_CACHE_TIMEOUT,
+        )
+    if cluster_run == NO_CLUSTER_RUN:
+        return None
+    return cluster_run
 
 
 def filter_recientes(queryset: QuerySet, *, user=None, session_key: Optional[str] = None) -> QuerySet:
@@ -74,7 +139,6 @@ def get_confort_noticia_ids(
         Set of noticia IDs, or None if no cluster membership (caller should fall back to recientes).
     """
     from core.models import (
-        VoterClusterRun,
         VoterClusterMembership,
         ClusterVotingPattern,
         Voto,
@@ -84,31 +148,36 @@ def get_confort_noticia_ids(
     if not voter_id:
         return None
 
-    cluster_run = (
-        VoterClusterRun.objects.filter(status="completed")
-        .order_by("-created_at")
-        .first()
-    )
+    cluster_run = get_latest_cluster_run()
     if not cluster_run:
         return None
 
-    membership = VoterClusterMembership.objects.filter(
-        cluster__run=cluster_run,
-        cluster__cluster_type="group",
-        voter_type=voter_type,
-        voter_id=voter_id,
-    ).select_related("cluster").first()
-    if not membership:
-        membership = VoterClusterMembership.objects.filter(
+    # Group and base memberships in one query; prefer the group cluster
+    memberships = list(
+        VoterClusterMembership.objects.filter(
             cluster__run=cluster_run,
-            cluster__cluster_type="base",
+            cluster__cluster_type__in=["group", "base"],
             voter_type=voter_type,
             voter_id=voter_id,
-        ).select_related("cluster").first()
+        )
+        .select_related("cluster")
+        .only(
+            "voter_type",
+            "voter_id",
+            "cluster__id",
+            "cluster__cluster_type",
+            "cluster__size",
+        )
+    )
+    membership = next(
+        (m for m in memberships if m.cluster.cluster_type == "group"),
+        None,
+    ) or next(iter(memberships), None)
     if not membership:
         return None
 
-    comfort_ids = set()
+    # Collect every source first and build the set once at the end
+    sources = []
 
     # 1) Cluster rates positively (consensus "buena" >= threshold)
     cluster_positive = ClusterVotingPattern.objects.filter(
@@ -116,57 +185,95 @@ def get_confort_noticia_ids(
         majority_opinion="buena",
         consensus_score__gte=cluster_consensus_min,
     ).values_list("noticia_id", flat=True)
-    comfort_ids.update(cluster_positive)
+    sources.append(cluster_positive)
 
     # 2) "People who vote like you also liked these" — other cluster members voted "buena"
-    other_members = list(
-        membership.cluster.members.exclude(
-            voter_type=voter_type, voter_id=voter_id
-        ).values_list("voter_type", "voter_id")
-    )
-    if other_members:
-        user_ids = []
-        for m in other_members:
-            if m[0] == "user":
-                try:
-                    user_ids.append(int(m[1]))
-                except (ValueError, TypeError):
-                    pass
-        session_keys = [m[1] for m in other_members if m[0] == "session"]
-        if user_ids or session_keys:
-            q = Q(opinion="buena")
-            if user_ids and session_keys:
-                q &= Q(usuario_id__in=user_ids) | Q(session_key__in=session_keys)
-            elif user_ids:
-                q &= Q(usuario_id__in=user_ids)
-            else:
-                q &= Q(session_key__in=session_keys)
-            cluster_peers_buena = (
-                Voto.objects.filter(q).values_list("noticia_id", flat=True).distinct()
-            )
-            comfort_ids.update(cluster_peers_buena)
-
-    # 3) Noticias about entities they've engaged with positively
-    my_buena_votes = Voto.objects.filter(
-        **lookup_data, opinion="buena"
-    ).values_list("noticia_id", flat=True)
-    if my_buena_votes:
-        liked_entity_ids = set(
-            NoticiaEntidad.objects.filter(
-                noticia_id__in=my_buena_votes,
-                sentimiento="positivo",
-            ).values_list("entidad_id", flat=True)
+    # A singleton cluster has no peers: skip the member read entirely
+    user_ids, session_keys = [], []
+    if membership.cluster.size > 1:
+        # Member list is cached per cluster; drop the current voter in Python.
+        # User voter_ids are stored as strings.
+        self_key = (voter_type, str(voter_id))
+        other_members = [
+            m for m in get_cluster_member_keys(membership.cluster) if m != self_key
+        ]
+        # Skip malformed user voter_ids rather than failing the feed
+        user_ids = [
+            int(vid) for vt, vid in other_members
+            if vt == "user" and vid and vid.isascii() and vid.isdigit()
+        ]
+        session_keys = [vid for vt, vid in other_members if vt == "session"]
+
+    # One query per voter column instead of an OR across columns, so
+    # each side can use its (opinion, ...) index
+    if user_ids:
+        sources.append(
+            Voto.objects.filter(
+                opinion="buena", usuario_id__in=user_ids
+            ).values_list("noticia_id", flat=True)
         )
-        if liked_entity_ids:
-            noticias_about_liked = NoticiaEntidad.objects.filter(
-                entidad_id__in=liked_entity_ids,
-                sentimiento="positivo",
+    if session_keys:
+        sources.append(
+            Voto.objects.filter(
+                opinion="buena", session_key__in=session_keys
             ).values_list("noticia_id", flat=True)
-            comfort_ids.update(noticias_about_liked)
+        )
 
+    # 3) Noticias about entities they've engaged with positively
+    # Kept lazy: used as a subquery, never materialized in Python
+    my_buena_votes = Voto.objects.filter(**lookup_data, opinion="buena")
+    if my_buena_votes.exists():
+        # Liked entities stay a subquery: one SELECT for the whole expansion
+        liked_entity_ids = NoticiaEntidad.objects.filter(
+            noticia_id__in=my_buena_votes.values("noticia_id"),
+            sentimiento="positivo",
+        ).values("entidad_id")
+        noticias_about_liked = NoticiaEntidad.objects.filter(
+            entidad_id__in=liked_entity_ids,
+            sentimiento="positivo",
+        ).values_list("noticia_id", flat=True)
+        sources.append(noticias_about_liked)
+
+    comfort_ids = set().union(*sources)
     return comfort_ids if comfort_ids else None
 
 
+def get_puente_consensus_ids(
+    cluster_run,
+    *,
+    consensus_threshold: float = PUENTE_CONSENSUS_THRESHOLD,
+    min_votes_per_cluster: int = PUENTE_MIN_VOTES_PER_CLUSTER,
+) -> list:
+    """
+    Every consensus noticia ID of cluster_run, highest agreement first.
+
+    Not voter-specific, so it is cached per run; callers apply their own
+    exclusions and top_n cut. The scores come from current Voto rows, not a
+    snapshot of the run, so the cached order can trail votes cast since it
+    was computed by up to PUENTE_CONSENSUS_CACHE_TIMEOUT.
+    """
+    from core.clustering.consensus import calculate_consensus_news
+
+    def compute():
+        consensus_list = calculate_consensus_news(
+            cluster_run,
+            min_votes_per_cluster=min_votes_per_cluster,
+            consensus_threshold=consensus_threshold,
+            top_n=None,
+        )
+        return [r["noticia_id"] for r in consensus_list]
+
+    return cache.get_or_set(
+        PUENTE_CONSENSUS_CACHE_KEY.format(
+            run_id=cluster_run.id,
+            threshold=consensus_threshold,
+            min_votes=min_votes_per_cluster,
+        ),
+        compute,
+        timeout=PUENTE_CONSENSUS_CACHE_TIMEOUT,
+    )
+
+
 def get_puente_ordered_noticia_ids(
     lookup_data: dict,
     *,
@@ -190,31 +297,28 @@ def get_puente_ordered_noticia_ids(
         List of noticia IDs in consensus order (highest agreement first), excluding voted.
         Empty list if no cluster run or no consensus data.
     """
-    from core.clustering.consensus import calculate_consensus_news
-    from core.models import VoterClusterRun, Voto
+    from core.models import Voto
 
-    cluster_run = (
-        VoterClusterRun.objects.filter(status="completed")
-        .order_by("-created_at")
-        .first()
-    )
+    cluster_run = get_latest_cluster_run()
     if not cluster_run:
         return []
 
-    consensus_list = calculate_consensus_news(
+    consensus_ids = get_puente_consensus_ids(
         cluster_run,
-        min_votes_per_cluster=min_votes_per_cluster,
         consensus_threshold=consensus_threshold,
-        top_n=top_n,
+        min_votes_per_cluster=min_votes_per_cluster,
     )
-    if not consensus_list:
+    if not consensus_ids:
         return []
 
-    ordered_ids = [r["noticia_id"] for r in consensus_list]
-
-    # Exclude already voted
+    # Per-voter part: drop already voted, then cut to top_n. Each noticia's
+    # consensus only depends on its own votes, so excluding after ordering
+    # gives the same list as excluding before.
+    # Streamed straight into the set: no intermediate list of all voted ids
     voted = set(
-        Voto.objects.filter(**lookup_data).values_list("noticia_id", flat=True)
+        Voto.objects.filter(**lookup_data)
+        .values_list("noticia_id", flat=True)
+        .iterator(chunk_size=VOTED_IDS_CHUNK_SIZE)
     )
-    ordered_ids = [nid for nid in ordered_ids if nid not in voted]
-    return ordered_ids
+    ordered = [nid for nid in consensus_ids if nid not in voted]
+    return ordered[:top_n]
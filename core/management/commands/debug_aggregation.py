@@ -5,10 +5,11 @@ Usage:
     python manage.py debug_aggregation <cluster_id>
 """
 
+import sys
+
 from django.core.management.base import BaseCommand
 from core.models import VoterCluster, VoterClusterMembership, VoterClusterRun
 from core.clustering import build_vote_matrix, compute_cluster_voting_aggregation
-from scipy.sparse import issparse
 import numpy as np
 
 
@@ -53,6 +54,10 @@ class Command(BaseCommand):
             min_votes_per_voter=min_votes
         )
         
+        # Convert once: rows are read from CSR, columns from CSC
+        vote_matrix_csr = vote_matrix.tocsr()
+        vote_matrix_csc = vote_matrix.tocsc()
+
         self.stdout.write(f"Matrix shape: {vote_matrix.shape}")
         self.stdout.write(f"Voters in matrix: {len(voter_ids_list)}")
         self.stdout.write(f"Noticias in matrix: {len(noticia_ids_list)}")
@@ -61,16 +66,17 @@ class Command(BaseCommand):
         memberships = VoterClusterMembership.objects.filter(cluster=cluster)
         self.stdout.write(f"\nCluster members: {memberships.count()}")
         
-        # Map members to matrix indices
+        # Map members to matrix indices; voter types are interned so key
+        # comparisons on lookup hit the identity fast path
         voter_id_to_index = {
-            (vt, vid): idx for idx, (vt, vid) in enumerate(voter_ids_list)
+            (sys.intern(vt), vid): idx for idx, (vt, vid) in enumerate(voter_ids_list)
         }
         
         cluster_member_indices = []
         members_not_in_matrix = []
         
         for membership in memberships:
-            voter_key = (membership.voter_type, membership.voter_id)
+            voter_key = (sys.intern(membership.voter_type), membership.voter_id)
             if voter_key in voter_id_to_index:
                 cluster_member_indices.append(voter_id_to_index[voter_key])
             else:
@@ -90,6 +96,7 @@ class Command(BaseCommand):
         
         # Get noticias voted by cluster members
         from core.models import Voto
+        from django.db.models import Q
         from django.utils import timezone
         from datetime import timedelta
         
@@ -98,15 +105,18 @@ class Command(BaseCommand):
             (m.voter_type, m.voter_id) for m in memberships
         ]
         
-        # Get all noticias voted by members
-        member_noticia_ids = set()
-        for vt, vid in member_voter_keys[:10]:  # Sample first 10
-            if vt == 'user':
-                votes = Voto.objects.filter(usuario_id=vid, fecha_voto__gte=cutoff_date)
-            else:
-                votes = Voto.objects.filter(session_key=vid, fecha_voto__gte=cutoff_date)
-            noticia_ids = set(votes.values_list('noticia_id', flat=True))
-            member_noticia_ids.update(noticia_ids)
+        # Get all noticias voted by members (sample first 10, one query)
+        sample_keys = member_voter_keys[:10]
+        sample_user_ids = [vid for vt, vid in sample_keys if vt == 'user']
+        sample_session_keys = [vid for vt, vid in sample_keys if vt != 'user']
+        member_noticia_ids = set(
+            Voto.objects.filter(fecha_voto__gte=cutoff_date)
+            .filter(
+                Q(usuario_id__in=sample_user_ids)
+                | Q(session_key__in=sample_session_keys)
+            )
+            .values_list('noticia_id', flat=True)
+        )
         
         self.stdout.write(f"\nSample noticias voted by members: {len(member_noticia_ids)}")
         self.stdout.write(f"Noticias in matrix: {len(noticia_ids_list)}")
@@ -127,101 +137,77 @@ class Command(BaseCommand):
         
         # Try aggregation
         self.stdout.write(f"\nAttempting aggregation with {len(cluster_member_indices)} members...")
-        cluster_members_array = np.array(cluster_member_indices)
+        cluster_members_array = np.asarray(cluster_member_indices, dtype=np.int64)
         
         # Debug: Check what votes are in the matrix for these members
         self.stdout.write("\nDebugging matrix contents:")
         sample_member_idx = cluster_member_indices[0] if cluster_member_indices else None
         if sample_member_idx is not None:
-            row = vote_matrix[sample_member_idx, :]
-            if issparse(row):
-                # Convert to CSR to access indices/data
-                row_csr = row.tocsr()
-                non_zero_indices = row_csr.indices
-                non_zero_values = row_csr.data
-                self.stdout.write(
-                    f"  Member {sample_member_idx} has {len(non_zero_indices)} votes in matrix"
-                )
-                if len(non_zero_indices) > 0:
-                    sample_noticia_indices = non_zero_indices[:5]
-                    self.stdout.write("  Sample noticia indices in matrix:")
-                    for nidx in sample_noticia_indices:
-                        if nidx < len(noticia_ids_list):
+            row_csr = vote_matrix_csr[sample_member_idx, :]
+            non_zero_indices = row_csr.indices
+            self.stdout.write(
+                f"  Member {sample_member_idx} has {len(non_zero_indices)} votes in matrix"
+            )
+            if len(non_zero_indices) > 0:
+                sample_noticia_indices = non_zero_indices[:5]
+                self.stdout.write("  Sample noticia indices in matrix:")
+                for nidx in sample_noticia_indices:
+                    if nidx < len(noticia_ids_list):
+                        self.stdout.write(
+                            f"    Index {nidx} -> Noticia {noticia_ids_list[nidx]}"
+                        )
+                
+                # Debug: Check if these noticias are found during aggregation
+                self.stdout.write("\n  Checking if these noticias are found during aggregation:")
+                cluster_set = frozenset(cluster_member_indices)
+                for nidx in sample_noticia_indices[:3]:
+                    if nidx < len(noticia_ids_list):
+                        noticia_id = noticia_ids_list[nidx]
+                        # Column nidx of the CSC matrix is a contiguous run of
+                        # its indices array; the stored row indices are the voters
+                        start, end = (
+                            vote_matrix_csc.indptr[nidx],
+                            vote_matrix_csc.indptr[nidx + 1],
+                        )
+                        column_rows = vote_matrix_csc.indices[start:end]
+                        row_indices_with_votes = column_rows.tolist()
+                        
+                        row_set = set(row_indices_with_votes)
+                        in_column = np.isin(cluster_members_array, column_rows)
+                        cluster_members_in_column = cluster_members_array[in_column]
+                        
+                        # Debug: Check if sample_member_idx is in the column
+                        sample_in_column = sample_member_idx in row_set
+                        
+                        # Also check the actual value in the matrix directly
+                        idx_pos = np.flatnonzero(row_csr.indices == nidx)
+                        actual_value = row_csr.data[idx_pos[0]] if len(idx_pos) > 0 else 0.0
+                        
+                        self.stdout.write(
+                            f"    Noticia {noticia_id} (idx {nidx}): "
+                            f"{len(row_indices_with_votes)} total votes, "
+                            f"{len(cluster_members_in_column)} from cluster, "
+                            f"sample member {sample_member_idx} in column: {sample_in_column}, "
+                            f"actual value at [{sample_member_idx}, {nidx}]: {actual_value}"
+                        )
+                        
+                        # Debug: Show some of the row indices that voted
+                        if len(row_indices_with_votes) > 0:
                             self.stdout.write(
-                                f"    Index {nidx} -> Noticia {noticia_ids_list[nidx]}"
+                                f"      Sample voters who voted: {row_indices_with_votes[:5]}"
                             )
-                    
-                    # Debug: Check if these noticias are found during aggregation
-                    self.stdout.write("\n  Checking if these noticias are found during aggregation:")
-                    vote_matrix_csr = vote_matrix.tocsr()
-                    for nidx in sample_noticia_indices[:3]:
-                        if nidx < len(noticia_ids_list):
-                            noticia_id = noticia_ids_list[nidx]
-                            # Access column the same way as in compute_cluster_voting_aggregation
-                            column = vote_matrix_csr[:, nidx]
-                            # For CSR, accessing a column returns a column vector (1D)
-                            # We need to get the row indices that have non-zero values
-                            if issparse(column):
-                                # For a column vector CSR, we need to use nonzero() to get row indices
-                                # column.nonzero() returns (row_indices, col_indices)
-                                row_indices_with_votes, _ = column.nonzero()
-                                row_indices_with_votes = row_indices_with_votes.tolist()
-                                # Get the data values for those rows
-                                data_values = column.data
-                            else:
-                                # Dense case
-                                row_indices_with_votes = np.where(column != 0)[0].tolist()
-                                data_values = column[column != 0]
-                            
-                            cluster_members_in_column = [v for v in cluster_member_indices if v in row_indices_with_votes]
-                            
-                            # Debug: Check if sample_member_idx is in the column
-                            sample_in_column = sample_member_idx in row_indices_with_votes
-                            
-                            # Also check the actual value in the matrix directly
-                            if sample_member_idx < vote_matrix.shape[0] and nidx < vote_matrix.shape[1]:
-                                # Access directly from the original matrix
-                                row_data = vote_matrix[sample_member_idx, :]
-                                if issparse(row_data):
-                                    row_csr = row_data.tocsr()
-                                    if nidx in row_csr.indices:
-                                        idx_pos = np.where(row_csr.indices == nidx)[0]
-                                        if len(idx_pos) > 0:
-                                            actual_value = row_csr.data[idx_pos[0]]
-                                        else:
-                                            actual_value = 0.0
-                                    else:
-                                        actual_value = 0.0
-                                else:
-                                    actual_value = float(row_data[nidx])
-                            else:
-                                actual_value = None
-                            
                             self.stdout.write(
-                                f"    Noticia {noticia_id} (idx {nidx}): "
-                                f"{len(row_indices_with_votes)} total votes, "
-                                f"{len(cluster_members_in_column)} from cluster, "
-                                f"sample member {sample_member_idx} in column: {sample_in_column}, "
-                                f"actual value at [{sample_member_idx}, {nidx}]: {actual_value}"
+                                f"      Sample cluster members: {cluster_member_indices[:5]}"
                             )
-                            
-                            # Debug: Show some of the row indices that voted
-                            if len(row_indices_with_votes) > 0:
-                                self.stdout.write(
-                                    f"      Sample voters who voted: {row_indices_with_votes[:5]}"
-                                )
-                                self.stdout.write(
-                                    f"      Sample cluster members: {cluster_member_indices[:5]}"
-                                )
-                                # Check if there's any overlap
-                                overlap = set(row_indices_with_votes) & set(cluster_member_indices)
+                            # Both sides are sets, so only the smaller one is iterated
+                            overlap = cluster_set.intersection(row_set)
+                            self.stdout.write(
+                                f"      Overlap: {len(overlap)} members"
+                            )
+                            if len(overlap) > 0:
                                 self.stdout.write(
-                                    f"      Overlap: {len(overlap)} members"
+                                    f"      Overlapping members: {list(overlap)[:5]}"
                                 )
-                                if len(overlap) > 0:
-                                    self.stdout.write(
-                                        f"      Overlapping members: {list(overlap)[:5]}"
-                                    )
         
         aggregation = compute_cluster_voting_aggregation(
             cluster_members_array,
@@ -249,11 +235,7 @@ class Command(BaseCommand):
             # Check if members have any votes in matrix
             total_votes_in_matrix = 0
             for member_idx in cluster_member_indices[:10]:  # Sample first 10
-                row = vote_matrix[member_idx, :]
-                if issparse(row):
-                    # Convert to CSR to access indices
-                    row_csr = row.tocsr()
-                    total_votes_in_matrix += len(row_csr.indices)
+                total_votes_in_matrix += vote_matrix_csr[member_idx, :].nnz
             self.stdout.write(
                 f"  Total votes in matrix (sample of 10 members): {total_votes_in_matrix}"
             )
@@ -5,7 +5,11 @@ Usage:
     python manage.py diagnose_cluster [cluster_id]
 """
 
+from datetime import timedelta
+
 from django.core.management.base import BaseCommand
+from django.db.models import Count, Prefetch, Q, Window
+from django.utils import timezone
 from core.models import VoterCluster, ClusterVotingPattern, VoterClusterMembership
 
 
@@ -36,119 +40,149 @@ class Command(BaseCommand):
         self.stdout.write(f"Analyzing run: {run.id} (created: {run.created_at})")
         self.stdout.write("=" * 80)
         
+        # Run parameters are the same for every cluster
+        run_params = run.parameters or {}
+        time_window = run_params.get('time_window_days', 30)
+        min_votes = run_params.get('min_votes_per_voter', 3)
+        cutoff_date = timezone.now() - timedelta(days=time_window)
+        in_window = Q(fecha_voto__gte=cutoff_date)
+        
         if cluster_id is not None:
             clusters = run.clusters.filter(cluster_id=cluster_id, cluster_type='group')
         else:
             clusters = run.clusters.filter(cluster_type='group').order_by('cluster_id')
         
+        # Only the columns the report prints; metadata, LLM text and entity
+        # JSON stay unread. Pattern counts come from the annotation; only the
+        # top 3 patterns per cluster are fetched (a sliced prefetch is one
+        # windowed query for all clusters)
+        clusters = clusters.only(
+            'id', 'run', 'cluster_id', 'size', 'consensus_score'
+        ).annotate(
+            pattern_count=Count('voting_patterns')
+        ).prefetch_related(
+            Prefetch(
+                'voting_patterns',
+                queryset=ClusterVotingPattern.objects.order_by(
+                    '-consensus_score'
+                )[:3],
+                to_attr='top_patterns',
+            )
+        )
+        
+        # Report lines are buffered and written once at the end
+        lines = []
+        write = lines.append
+        
         for cluster in clusters:
-            self.stdout.write(f"\nCluster {cluster.cluster_id}:")
-            self.stdout.write(f"  Size: {cluster.size} members")
-            self.stdout.write(f"  Consensus: {cluster.consensus_score or 0:.2%}")
+            write(f"\nCluster {cluster.cluster_id}:")
+            write(f"  Size: {cluster.size} members")
+            write(f"  Consensus: {cluster.consensus_score or 0:.2%}")
             
             # Count voting patterns
-            pattern_count = cluster.voting_patterns.count()
-            self.stdout.write(f"  Voting patterns: {pattern_count}")
+            pattern_count = cluster.pattern_count
+            write(f"  Voting patterns: {pattern_count}")
             
             if pattern_count == 0:
-                self.stdout.write(self.style.WARNING(
+                write(self.style.WARNING(
                     f"  ⚠️  WARNING: Cluster has {cluster.size} members but NO voting patterns!"
                 ))
                 
                 # Check if this is a data issue - verify run parameters
-                run_params = run.parameters or {}
-                time_window = run_params.get('time_window_days', 30)
-                self.stdout.write(
+                write(
                     f"  Run parameters: time_window={time_window}d, "
-                    f"min_votes_per_voter={run_params.get('min_votes_per_voter', 3)}"
+                    f"min_votes_per_voter={min_votes}"
                 )
                 
-                # Check memberships
-                memberships = VoterClusterMembership.objects.filter(cluster=cluster)
-                self.stdout.write(f"  Memberships in DB: {memberships.count()}")
+                # Check memberships. The stored count is compared against
+                # cluster.size, so it is read from the DB: a COUNT(*) OVER ()
+                # window on the sample rows, one query for both
+                sample_members = list(
+                    VoterClusterMembership.objects.filter(cluster=cluster)
+                    .only('voter_type', 'voter_id')
+                    .annotate(memberships_total=Window(Count('id')))[:5]
+                )
+                memberships_total = (
+                    sample_members[0].memberships_total if sample_members else 0
+                )
+                write(f"  Memberships in DB: {memberships_total}")
                 
                 # Sample a few members to see if they have votes and which noticias
-                sample_members = memberships[:5]
                 if sample_members:
-                    self.stdout.write("  Sample members:")
+                    write("  Sample members:")
                     from core.models import Voto
-                    all_noticia_ids = set()
-                    individual_noticia_sets = []
                     
-                    run_params = run.parameters or {}
-                    time_window = run_params.get('time_window_days', 30)
-                    min_votes = run_params.get('min_votes_per_voter', 3)
-                    from django.utils import timezone
-                    from datetime import timedelta
-                    cutoff_date = timezone.now() - timedelta(days=time_window)
+                    user_ids = [m.voter_id for m in sample_members if m.voter_type == 'user']
+                    session_keys = [m.voter_id for m in sample_members if m.voter_type == 'session']
+                    
+                    sample_votes = Voto.objects.filter(
+                        Q(usuario_id__in=user_ids) | Q(session_key__in=session_keys)
+                    )
+                    
+                    # Vote counts for all sampled members in one grouped query
+                    # instead of two counts per member
+                    vote_counts = {}
+                    for row in sample_votes.values('usuario_id', 'session_key').annotate(
+                        total=Count('id'), recent=Count('id', filter=in_window)
+                    ):
+                        voter_keys = []
+                        if row['usuario_id'] is not None:
+                            voter_keys.append(('user', str(row['usuario_id'])))
+                        if row['session_key'] is not None:
+                            voter_keys.append(('session', row['session_key']))
+                        for voter_key in voter_keys:
+                            counts = vote_counts.setdefault(voter_key, {'total': 0, 'recent': 0})
+                            counts['total'] += row['total']
+                            counts['recent'] += row['recent']
+                    
+                    # Unique and total in-window noticias across the sample,
+                    # aggregated in the database in one query
+                    sample_totals = sample_votes.filter(in_window).aggregate(
+                        unique_noticias=Count('noticia_id', distinct=True),
+                        total_votes=Count('id'),
+                    )
                     
                     for membership in sample_members:
-                        if membership.voter_type == 'user':
-                            all_votes = Voto.objects.filter(usuario_id=membership.voter_id)
-                            recent_votes = all_votes.filter(fecha_voto__gte=cutoff_date)
-                        else:  # session
-                            all_votes = Voto.objects.filter(session_key=membership.voter_id)
-                            recent_votes = all_votes.filter(fecha_voto__gte=cutoff_date)
-                        
-                        total_vote_count = all_votes.count()
-                        recent_vote_count = recent_votes.count()
-                        noticia_ids = set(recent_votes.values_list('noticia_id', flat=True))
-                        all_noticia_ids.update(noticia_ids)
-                        individual_noticia_sets.append(noticia_ids)
+                        voter_key = (membership.voter_type, membership.voter_id)
+                        counts = vote_counts.get(voter_key, {})
+                        total_vote_count = counts.get('total', 0)
+                        recent_vote_count = counts.get('recent', 0)
                         
+                        # One vote per voter per noticia, so in-window votes
+                        # are also the number of noticias voted on
                         qualified = "✓" if recent_vote_count >= min_votes else "✗"
-                        self.stdout.write(
+                        write(
                             f"    {qualified} {membership.voter_type}:{membership.voter_id[:20]}... - "
                             f"{recent_vote_count}/{total_vote_count} votes in window "
-                            f"on {len(noticia_ids)} noticias"
+                            f"on {recent_vote_count} noticias"
                         )
                     
                     # Check if there's overlap
                     if len(sample_members) > 1:
-                        total_individual = sum(len(s) for s in individual_noticia_sets)
-                        self.stdout.write(
-                            f"  Total unique noticias in sample: {len(all_noticia_ids)} "
+                        unique_noticias = sample_totals['unique_noticias']
+                        total_individual = sample_totals['total_votes']
+                        write(
+                            f"  Total unique noticias in sample: {unique_noticias} "
                             f"(sum of individual: {total_individual})"
                         )
-                        if len(all_noticia_ids) == total_individual:
-                            self.stdout.write(self.style.WARNING(
+                        if unique_noticias == total_individual:
+                            write(self.style.WARNING(
                                 "  ⚠️  No overlap: Each member voted on different noticias!"
                             ))
                         else:
-                            overlap_count = total_individual - len(all_noticia_ids)
-                            self.stdout.write(
+                            overlap_count = total_individual - unique_noticias
+                            write(
                                 f"  ✓ Overlap detected: {overlap_count} shared votes"
                             )
-                            
-                            # Check if these noticias are in the time window
-                            from django.utils import timezone
-                            from datetime import timedelta
-                            from core.models import Voto
-                            
-                            time_window = run.parameters.get('time_window_days', 30) if run.parameters else 30
-                            cutoff_date = timezone.now() - timedelta(days=time_window)
-                            
-                            recent_votes = Voto.objects.filter(
-                                noticia_id__in=all_noticia_ids,
-                                fecha_voto__gte=cutoff_date
-                            ).values_list('noticia_id', flat=True).distinct()
-                            
-                            self.stdout.write(
-                                f"  Noticias in time window ({time_window}d): "
-                                f"{len(set(recent_votes))} out of {len(all_noticia_ids)}"
-                            )
-                            
-                            if len(set(recent_votes)) < len(all_noticia_ids):
-                                self.stdout.write(self.style.WARNING(
-                                    f"  ⚠️  Some noticias voted by members are OUTSIDE time window!"
-                                ))
             else:
                 # Show top patterns
-                top_patterns = cluster.voting_patterns.order_by('-consensus_score')[:3]
-                self.stdout.write("  Top voting patterns:")
-                for pattern in top_patterns:
-                    self.stdout.write(
+                write("  Top voting patterns:")
+                for pattern in cluster.top_patterns:
+                    write(
                         f"    Noticia {pattern.noticia_id}: "
                         f"{pattern.count_buena}B/{pattern.count_mala}M/{pattern.count_neutral}N "
                         f"(consensus: {pattern.consensus_score:.2%})"
                     )
+        
+        if lines:
+            self.stdout.write("\n".join(lines))
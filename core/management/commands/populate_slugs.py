@@ -1,8 +1,9 @@
 # populate_slugs.py
 
 from django.core.management.base import BaseCommand
-from django.utils.text import slugify
-from core.models import Noticia
+from core.models import Noticia, slugify_title
+
+SLUG_CHUNK_SIZE = 2000
 
 
 class Command(BaseCommand):
@@ -10,41 +11,43 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         noticias_without_slug = Noticia.objects.filter(slug__isnull=True)
-        count = noticias_without_slug.count()
 
-        if count == 0:
+        # exists() for the early exit; the total is reported after the single
+        # pass instead of counting up front
+        if not noticias_without_slug.exists():
             self.stdout.write(
                 self.style.SUCCESS("All noticias already have slugs")
             )
             return
 
-        self.stdout.write(
-            f"Found {count} noticias without slugs. Generating..."
-        )
+        self.stdout.write("Found noticias without slugs. Generating...")
 
-        used_slugs = set(
-            Noticia.objects.filter(slug__isnull=False).values_list(
-                "slug", flat=True
-            )
+        # Keyset pages over the rows still missing a slug; each page is
+        # written before the next is read, so only one page is in memory and
+        # its collision lookup already sees the slugs assigned before it
+        pending = noticias_without_slug.only("pk", "meta_titulo", "slug").order_by(
+            "pk"
         )
-
-        for noticia in noticias_without_slug:
-            base_slug = slugify(
-                noticia.meta_titulo or f"noticia-{noticia.pk}"
-            )
-            slug = base_slug
-            counter = 1
-
-            while slug in used_slugs:
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-
-            noticia.slug = slug
-            used_slugs.add(slug)
-            noticia.save(update_fields=["slug"])
+        updated = 0
+        last_pk = 0
+        while chunk := list(pending.filter(pk__gt=last_pk)[:SLUG_CHUNK_SIZE]):
+            base_slugs = [
+                slugify_title(noticia.meta_titulo or f"noticia-{noticia.pk}")
+                for noticia in chunk
+            ]
+            used_slugs = Noticia.existing_slugs_like(base_slugs)
+
+            for noticia, base_slug in zip(chunk, base_slugs):
+                slug = Noticia.first_free_slug(base_slug, used_slugs)
+                noticia.slug = slug
+                used_slugs.add(slug)
+
+            Noticia.objects.bulk_update(chunk, ["slug"], batch_size=1000)
+            updated += len(chunk)
+            last_pk = chunk[-1].pk
 
         self.stdout.write(
             self.style.SUCCESS(
-                f"Successfully generated slugs for {count} noticias"
+                f"Successfully generated slugs for {updated} noticias"
             )
         )
@@ -1,7 +1,7 @@
 # test_email.py
 
 from django.core.management.base import BaseCommand
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection
 from django.conf import settings
 
 
@@ -35,13 +35,16 @@ class Command(BaseCommand):
             self.stdout.write(f"SSL: {settings.EMAIL_USE_SSL}")
 
         try:
-            send_mail(
-                subject="Test Email from memoria.uy",
-                message="This is a test email from memoria.uy. If you receive this, your SMTP configuration is working correctly!",
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[recipient],
-                fail_silently=False,
-            )
+            # Explicit connection, opened once and closed on exit; extra
+            # messages can go through connection.send_messages()
+            with get_connection() as connection:
+                EmailMessage(
+                    subject="Test Email from memoria.uy",
+                    body="This is a test email from memoria.uy. If you receive this, your SMTP configuration is working correctly!",
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    to=[recipient],
+                    connection=connection,
+                ).send()
             self.stdout.write(
                 self.style.SUCCESS(
                     f"✓ Email sent successfully to {recipient}"
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 11:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0023_add_reengagement_email_enabled"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="voto",
+            index=models.Index(
+                fields=["opinion", "usuario"], name="core_voto_opinion_f070aa_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="voto",
+            index=models.Index(
+                fields=["opinion", "session_key"], name="core_voto_opinion_41c210_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 11:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0024_add_voto_opinion_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="clustervotingpattern",
+            name="core_cluste_cluster_b4ab55_idx",
+        ),
+        migrations.AddIndex(
+            model_name="clustervotingpattern",
+            index=models.Index(
+                fields=["cluster", "majority_opinion", "consensus_score"],
+                name="core_cluste_cluster_5f2637_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="noticiaentidad",
+            index=models.Index(
+                fields=["noticia", "sentimiento"], name="core_notici_noticia_3b8107_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="noticiaentidad",
+            index=models.Index(
+                fields=["entidad", "sentimiento"], name="core_notici_entidad_4ea12b_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 11:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0025_add_feed_composite_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="voto",
+            index=models.Index(
+                fields=["usuario", "fecha_voto"], name="core_voto_usuario_ac16f8_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="voto",
+            index=models.Index(
+                fields=["session_key", "fecha_voto"],
+                name="core_voto_session_7903a4_idx",
+            ),
+        ),
+    ]
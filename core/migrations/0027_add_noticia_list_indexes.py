@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 11:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0026_add_voto_voter_fecha_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="noticia",
+            index=models.Index(
+                fields=["-fecha_agregado"], name="core_notici_fecha_a_901ad4_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="noticia",
+            index=models.Index(
+                condition=models.Q(("slug__isnull", True)),
+                fields=["id"],
+                name="noticia_no_slug_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 11:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0027_add_noticia_list_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="voto",
+            index=models.Index(
+                fields=["noticia", "opinion"], name="core_voto_noticia_fec33e_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="voto",
+            index=models.Index(
+                fields=["fecha_voto"], name="core_voto_fecha_v_f88081_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-17 11:49
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_vote_counts(apps, schema_editor):
+    """Fill count_buena/count_mala/count_neutral from existing votes."""
+    Noticia = apps.get_model("core", "Noticia")
+    Voto = apps.get_model("core", "Voto")
+
+    counts = {}
+    for opinion in ("buena", "mala", "neutral"):
+        per_noticia = (
+            Voto.objects.filter(noticia=OuterRef("pk"), opinion=opinion)
+            .order_by()
+            .values("noticia")
+            .annotate(n=Count("pk"))
+            .values("n")
+        )
+        counts[f"count_{opinion}"] = Coalesce(Subquery(per_noticia), 0)
+    Noticia.objects.update(**counts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0028_add_voto_aggregation_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="noticia",
+            name="count_buena",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="noticia",
+            name="count_mala",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="noticia",
+            name="count_neutral",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_vote_counts, migrations.RunPython.noop),
+    ]
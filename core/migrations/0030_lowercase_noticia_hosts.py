@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:01
+
+from urllib.parse import urlparse, urlunparse
+
+from django.db import migrations
+
+
+def lowercase_host(url):
+    """Lowercase the host of url, as core.utils.normalize_url now does."""
+    parsed = urlparse(url)
+    userinfo, at, host = parsed.netloc.rpartition("@")
+    return urlunparse(parsed._replace(netloc=f"{userinfo}{at}{host.lower()}"))
+
+
+def lowercase_noticia_hosts(apps, schema_editor):
+    """
+    Rewrite stored enlaces to the lowercased-host form new submissions use.
+    Rows whose rewritten URL already exists are left alone (merging their
+    votes is a manual decision).
+    """
+    Noticia = apps.get_model("core", "Noticia")
+
+    existing = set(Noticia.objects.values_list("enlace", flat=True))
+    skipped = 0
+    for pk, enlace in Noticia.objects.values_list("pk", "enlace").iterator():
+        lowered = lowercase_host(enlace)
+        if lowered == enlace:
+            continue
+        if lowered in existing:
+            skipped += 1
+            continue
+        Noticia.objects.filter(pk=pk).update(enlace=lowered)
+        existing.add(lowered)
+
+    if skipped:
+        print(f"Left {skipped} noticias whose lowercased URL already exists")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0029_add_noticia_vote_counts"),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_noticia_hosts, migrations.RunPython.noop),
+    ]
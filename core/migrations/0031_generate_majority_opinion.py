@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0030_lowercase_noticia_hosts"),
+    ]
+
+    # Django cannot alter a column into a generated one: drop the stored
+    # field (and the index on it) and add it back derived from the counts.
+    operations = [
+        migrations.RemoveIndex(
+            model_name="clustervotingpattern",
+            name="core_cluste_cluster_5f2637_idx",
+        ),
+        migrations.RemoveField(
+            model_name="clustervotingpattern",
+            name="majority_opinion",
+        ),
+        migrations.AddField(
+            model_name="clustervotingpattern",
+            name="majority_opinion",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(
+                        models.Q(
+                            ("count_buena__gte", models.F("count_mala")),
+                            ("count_buena__gte", models.F("count_neutral")),
+                        ),
+                        then=models.Value("buena"),
+                    ),
+                    models.When(
+                        count_mala__gte=models.F("count_neutral"),
+                        then=models.Value("mala"),
+                    ),
+                    default=models.Value("neutral"),
+                ),
+                output_field=models.CharField(max_length=10),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="clustervotingpattern",
+            index=models.Index(
+                fields=["cluster", "majority_opinion", "consensus_score"],
+                name="core_cluste_cluster_5f2637_idx",
+            ),
+        ),
+    ]
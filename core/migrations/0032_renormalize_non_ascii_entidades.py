@@ -0,0 +1,87 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:27
+
+import unicodedata
+
+from django.db import migrations
+
+# Frozen copy of core.models.normalize_entity_name as of this migration
+_ACCENT_TABLE = str.maketrans(
+    "áéíóúüñàèìòùâêîôûãõçäëïöÁÉÍÓÚÜÑÀÈÌÒÙÂÊÎÔÛÃÕÇÄËÏÖ",
+    "aeiouunaeiouaeiouaocaeioAEIOUUNAEIOUAEIOUAOCAEIO",
+)
+
+
+def normalize_name(name):
+    """Normalize entity name: lowercase, no accents, NFKC-recomposed."""
+    name = name.translate(_ACCENT_TABLE)
+    if not name.isascii():
+        nfkd = unicodedata.normalize('NFKD', name)
+        stripped = ''.join(c for c in nfkd if not unicodedata.combining(c))
+        name = unicodedata.normalize('NFKC', stripped)
+    return name.lower().strip()
+
+
+def renormalize_non_ascii_entities(apps, schema_editor):
+    """
+    Recompute normalized_name for entities with non-ASCII names, which the
+    NFKC recomposition changed (e.g. Hangul), and merge any entity whose
+    new name collides with an existing one, as 0017 did.
+    """
+    Entidad = apps.get_model('core', 'Entidad')
+    NoticiaEntidad = apps.get_model('core', 'NoticiaEntidad')
+
+    # (normalized_name, tipo) -> pk of the entity holding it
+    by_key = {
+        (normalized_name, tipo): pk
+        for pk, normalized_name, tipo in Entidad.objects.values_list(
+            'pk', 'normalized_name', 'tipo'
+        )
+    }
+
+    rows = Entidad.objects.order_by('pk').values_list(
+        'pk', 'nombre', 'normalized_name', 'tipo'
+    )
+    renamed = merged = 0
+    for pk, nombre, stored, tipo in list(rows):
+        if nombre.isascii():
+            continue
+        normalized = normalize_name(nombre)
+        if normalized == stored:
+            continue
+
+        if by_key.get((stored, tipo)) == pk:
+            del by_key[(stored, tipo)]
+        canonical = by_key.get((normalized, tipo))
+        if canonical is None:
+            Entidad.objects.filter(pk=pk).update(normalized_name=normalized)
+            by_key[(normalized, tipo)] = pk
+            renamed += 1
+            continue
+
+        # Same entity already exists: move links over, dropping the ones
+        # canonical already has for that noticia (unique noticia+entidad)
+        NoticiaEntidad.objects.filter(
+            entidad_id=pk,
+            noticia_id__in=NoticiaEntidad.objects.filter(
+                entidad_id=canonical
+            ).values('noticia_id'),
+        ).delete()
+        NoticiaEntidad.objects.filter(entidad_id=pk).update(entidad_id=canonical)
+        Entidad.objects.filter(pk=pk).delete()
+        merged += 1
+
+    if renamed or merged:
+        print(f"Renormalized {renamed} entities, merged {merged} duplicates")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0031_generate_majority_opinion"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            renormalize_non_ascii_entities, migrations.RunPython.noop
+        ),
+    ]
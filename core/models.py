@@ -1,6 +1,9 @@
 # models.py
 
-from django.db import models
+import re
+
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.utils import timezone
@@ -10,6 +13,26 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Slug insert attempts when concurrent submits race for the same slug
+SLUG_SAVE_ATTEMPTS = 3
+
+# Base slugs per collision lookup query, and the numeric -N suffix
+SLUG_LOOKUP_BATCH_SIZE = 100
+_SLUG_SUFFIX_RE = re.compile(r"[0-9]+")
+
+# Generic site logo some sources publish as og:image; never shown as a cover
+BLOCKED_IMAGE_FRAGMENT = "meta/la-diaria-1000x1000"
+
+
+class NoticiaManager(models.Manager):
+    def get_queryset(self):
+        """Noticias without captured_html, which can be a whole page of HTML."""
+        return super().get_queryset().defer("captured_html")
+
+    def with_html(self):
+        """Noticias with captured_html loaded, for enrichment and capture."""
+        return super().get_queryset()
+
 
 class Noticia(models.Model):
     """
@@ -50,20 +73,106 @@ class Noticia(models.Model):
         help_text="User who submitted (null if anonymous)"
     )
 
+    # Vote totals per opinion, kept in step with Voto by core.signals so
+    # majority filters read columns instead of aggregating votos
+    count_buena = models.PositiveIntegerField(default=0)
+    count_mala = models.PositiveIntegerField(default=0)
+    count_neutral = models.PositiveIntegerField(default=0)
+
+    objects = NoticiaManager()
+
+    class Meta:
+        indexes = [
+            # Timeline and sitemap order (slug is unique, so already indexed)
+            models.Index(fields=['-fecha_agregado']),
+            # populate_slugs: only the rows still missing a slug
+            models.Index(
+                fields=['id'],
+                condition=models.Q(slug__isnull=True),
+                name='noticia_no_slug_idx',
+            ),
+        ]
+
     def __str__(self):
         return self.meta_titulo or self.enlace
 
+    @classmethod
+    def existing_slugs_like(cls, base_slugs):
+        """Stored slugs equal to one of base_slugs or to one with a -N suffix."""
+        bases = sorted(set(base_slugs))
+        candidates = set()
+        # Exact and prefix lookups can use the slug indexes; batched so each
+        # query stays a modest OR of LIKE 'base-%' terms
+        for start in range(0, len(bases), SLUG_LOOKUP_BATCH_SIZE):
+            batch = bases[start:start + SLUG_LOOKUP_BATCH_SIZE]
+            condition = models.Q(slug__in=batch)
+            for base in batch:
+                condition |= models.Q(slug__startswith=f"{base}-")
+            candidates.update(
+                cls.objects.filter(condition).values_list("slug", flat=True)
+            )
+
+        # The prefix also matches "base-other-words"; keep base and base-N
+        bases = set(bases)
+        existing = set()
+        for slug in candidates:
+            head, _, suffix = slug.rpartition("-")
+            if slug in bases or (
+                head in bases and _SLUG_SUFFIX_RE.fullmatch(suffix)
+            ):
+                existing.add(slug)
+        return existing
+
+    @staticmethod
+    def first_free_slug(base_slug, used_slugs):
+        """base_slug, or base_slug-N with the smallest N not in used_slugs."""
+        slug = base_slug
+        counter = 1
+        while slug in used_slugs:
+            slug = f"{base_slug}-{counter}"
+            counter += 1
+        return slug
+
     def save(self, *args, **kwargs):
         """Auto-generate slug from title if not provided."""
-        if not self.slug:
-            base_slug = slugify(self.meta_titulo or f"noticia-{self.pk or ''}")
-            slug = base_slug
-            counter = 1
-            while Noticia.objects.filter(slug=slug).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-        super().save(*args, **kwargs)
+        if self.slug:
+            super().save(*args, **kwargs)
+            return
+
+        # One query for every colliding slug; retry if a concurrent submit
+        # takes the chosen one between the lookup and the insert
+        base_slug = slugify_title(self.meta_titulo or f"noticia-{self.pk or ''}")
+        for attempt in range(SLUG_SAVE_ATTEMPTS):
+            self.slug = self.first_free_slug(
+                base_slug, self.existing_slugs_like([base_slug])
+            )
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                slug_taken = Noticia.objects.filter(slug=self.slug).exists()
+                if not slug_taken or attempt == SLUG_SAVE_ATTEMPTS - 1:
+                    self.slug = None
+                    raise
+
+    @classmethod
+    def recount_votes(cls, queryset=None):
+        """Recompute count_* from Voto for queryset (default: every noticia)."""
+        counts = {
+            f"count_{opinion}": models.Subquery(
+                Voto.objects.filter(noticia=models.OuterRef("pk"), opinion=opinion)
+                .order_by()
+                .values("noticia")
+                .annotate(n=models.Count("pk"))
+                .values("n"),
+            )
+            for opinion in ("buena", "mala", "neutral")
+        }
+        queryset = cls.objects.all() if queryset is None else queryset
+        return queryset.update(
+            **{field: Coalesce(expr, 0) for field, expr in counts.items()}
+        )
 
     def get_absolute_url(self):
         """Return the canonical URL for this noticia."""
@@ -78,28 +187,73 @@ class Noticia(models.Model):
     @property
     def mostrar_imagen(self):
         """Display image, filtering out generic logos."""
-        if self.meta_imagen and "meta/la-diaria-1000x1000" not in self.meta_imagen:
-            return self.meta_imagen
-        return None
+        if not self.meta_imagen:
+            return None
+        return None if BLOCKED_IMAGE_FRAGMENT in self.meta_imagen else self.meta_imagen
 
     @property
     def mostrar_fecha(self):
         """Display date (just submission date for MVP)."""
         return self.fecha_agregado
 
-    def update_meta_from_url(self):
+    META_FIELDS = ["meta_titulo", "meta_imagen", "meta_descripcion"]
+
+    def apply_meta(self, title, image, description):
+        """Set whichever meta fields were found; return the names of those changed."""
+        changed = []
+        for field, value in zip(self.META_FIELDS, (title, image, description)):
+            if value:
+                setattr(self, field, value)
+                changed.append(field)
+        return changed
+
+    def update_meta_from_url(self, refresh=False):
         """
         Fetch title, image, and description from original URL meta tags.
         Fast, synchronous operation (just HTTP HEAD + parse <meta> tags).
+        Recent results for the same URL come from the cache unless refresh=True.
         """
-        title, image, description = parse.parse_from_meta_tags(self.enlace)
-        if title:
-            self.meta_titulo = title
-        if image:
-            self.meta_imagen = image
-        if description:
-            self.meta_descripcion = description
-        self.save()
+        fetch = parse.parse_from_meta_tags if refresh else parse.parse_from_meta_tags_cached
+        changed = self.apply_meta(*fetch(self.enlace))
+        if self.pk is None:
+            self.save()
+            return
+        # save() fills a missing slug from the (possibly new) title
+        if not self.slug:
+            changed.append("slug")
+        if changed:
+            self.save(update_fields=changed)
+
+    @classmethod
+    def bulk_update_meta(cls, noticias, max_workers=8, batch_size=50):
+        """
+        Refresh meta tags for many saved noticias.
+
+        Fetches run concurrently in a thread pool (the HTTP wait dominates);
+        each batch of results is written back with one bulk_update.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        noticias = list(noticias)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for start in range(0, len(noticias), batch_size):
+                batch = noticias[start:start + batch_size]
+                results = executor.map(
+                    lambda n: parse.parse_from_meta_tags_cached(n.enlace), batch
+                )
+                for noticia, meta in zip(batch, results):
+                    noticia.apply_meta(*meta)
+                cls.objects.bulk_update(batch, cls.META_FIELDS)
+
+
+class VotoManager(models.Manager):
+    def with_display(self):
+        """Votos with usuario and noticia joined in, so __str__ shows names."""
+        return (
+            self.get_queryset()
+            .select_related("usuario", "noticia")
+            .defer("noticia__captured_html")
+        )
 
 
 class Voto(models.Model):
@@ -134,6 +288,15 @@ class Voto(models.Model):
     )
     fecha_voto = models.DateTimeField(auto_now_add=True)
 
+    objects = VotoManager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Opinion as stored, so signals can move Noticia counts on change
+        instance._stored_opinion = instance.__dict__.get("opinion")
+        return instance
+
     class Meta:
         constraints = [
             # One vote per user per article (if authenticated)
@@ -149,10 +312,33 @@ class Voto(models.Model):
                 name='unique_session_vote'
             )
         ]
+        indexes = [
+            # Comfort feed: "buena" votes of cluster peers, split by column
+            models.Index(fields=['opinion', 'usuario']),
+            models.Index(fields=['opinion', 'session_key']),
+            # A voter's votes inside a time window (diagnose_cluster)
+            models.Index(fields=['usuario', 'fecha_voto']),
+            models.Index(fields=['session_key', 'fecha_voto']),
+            # Per-noticia opinion counts (timeline filters, consensus)
+            models.Index(fields=['noticia', 'opinion']),
+            # Vote matrix time window (build_vote_matrix)
+            models.Index(fields=['fecha_voto']),
+        ]
 
     def __str__(self):
-        voter = self.usuario.username if self.usuario else f"Anon-{self.session_key[:8]}"
-        return f"{voter} - {self.opinion} - {self.noticia}"
+        # Names only when usuario/noticia are already loaded (see
+        # Voto.objects.with_display()); ids otherwise, so no query per row
+        if not self.usuario_id:
+            voter = f"Anon-{self.session_key[:8]}"
+        elif Voto.usuario.is_cached(self):
+            voter = self.usuario.username
+        else:
+            voter = f"User-{self.usuario_id}"
+        noticia = (
+            self.noticia if Voto.noticia.is_cached(self)
+            else f"Noticia {self.noticia_id}"
+        )
+        return f"{voter} - {self.opinion} - {noticia}"
 
     @property
     def is_anonymous(self):
@@ -185,34 +371,34 @@ class Voto(models.Model):
         Raises:
             ValidationError: If user already has votes on same articles
         """
-        from django.db import transaction
-
         # Find all votes for this session
         session_votes = cls.objects.filter(session_key=session_key)
+        user_noticias = cls.objects.filter(usuario=user).values("noticia_id")
 
-        if not session_votes.exists():
-            return 0
-
-        # Check for conflicts (user already voted on same article)
-        session_noticias = session_votes.values_list("noticia_id", flat=True)
-        user_votes = cls.objects.filter(
-            usuario=user, noticia_id__in=session_noticias
-        )
-
-        if user_votes.exists():
-            conflicting = user_votes.values_list("noticia__enlace", flat=True)
-            raise ValidationError(
-                f"User already has votes on {len(conflicting)} articles "
-                f"from this session. Cannot claim votes."
-            )
-
-        # Transfer votes atomically
+        # Claim every non-conflicting vote in one UPDATE; anything left in
+        # the session conflicts with a user vote, so undo and report it
         with transaction.atomic():
-            count = session_votes.update(usuario=user, session_key=None)
+            count = session_votes.exclude(noticia_id__in=user_noticias).update(
+                usuario=user, session_key=None
+            )
+            n_conflicting = session_votes.count()
+            if n_conflicting:
+                raise ValidationError(
+                    f"User already has votes on {n_conflicting} articles "
+                    f"from this session. Cannot claim votes."
+                )
 
         return count
 
 
+# Accented letters common in Spanish/Portuguese names mapped straight to
+# ASCII: the same result as NFKD + dropping combining marks, in one translate()
+_ACCENT_TABLE = str.maketrans(
+    "áéíóúüñàèìòùâêîôûãõçäëïöÁÉÍÓÚÜÑÀÈÌÒÙÂÊÎÔÛÃÕÇÄËÏÖ",
+    "aeiouunaeiouaeiouaocaeioAEIOUUNAEIOUAEIOUAOCAEIO",
+)
+
+
 def normalize_entity_name(name: str) -> str:
     """
     Normalize entity name for deduplication.
@@ -220,11 +406,33 @@ def normalize_entity_name(name: str) -> str:
     - Remove accents/diacritics
     - Strip whitespace
     """
-    import unicodedata
-    # Normalize unicode, decompose accents, remove combining chars
-    nfkd = unicodedata.normalize('NFKD', name)
-    ascii_name = ''.join(c for c in nfkd if not unicodedata.combining(c))
-    return ascii_name.lower().strip()
+    name = name.translate(_ACCENT_TABLE)
+    if not name.isascii():
+        # Slow path for anything outside the table: decompose accents and
+        # compatibility forms (full-width, ligatures), remove combining chars,
+        # then recompose what is left (e.g. Hangul syllables)
+        import unicodedata
+        nfkd = unicodedata.normalize('NFKD', name)
+        stripped = ''.join(c for c in nfkd if not unicodedata.combining(c))
+        name = unicodedata.normalize('NFKC', stripped)
+    return name.lower().strip()
+
+
+# django.utils.text.slugify's substitutions, for the ASCII path below
+_SLUG_STRIP_RE = re.compile(r"[^\w\s-]")
+_SLUG_DASH_RE = re.compile(r"[-\s]+")
+
+
+def slugify_title(value: str) -> str:
+    """
+    Same result as django.utils.text.slugify, without the NFKD pass for
+    titles that are ASCII once common accents are translated.
+    """
+    value = value.translate(_ACCENT_TABLE)
+    if not value.isascii():
+        return slugify(value)
+    value = _SLUG_STRIP_RE.sub("", value.lower())
+    return _SLUG_DASH_RE.sub("-", value).strip("-_")
 
 
 class Entidad(models.Model):
@@ -257,10 +465,29 @@ class Entidad(models.Model):
             )
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Stored normalized_name already matches the loaded nombre
+        instance._normalized_nombre = instance.__dict__.get("nombre")
+        return instance
+
     def save(self, *args, **kwargs):
-        self.normalized_name = normalize_entity_name(self.nombre)
+        # Only renormalize when nombre changed since it was last normalized
+        if not self.normalized_name or self.nombre != getattr(self, "_normalized_nombre", None):
+            self.normalized_name = normalize_entity_name(self.nombre)
+            self._normalized_nombre = self.nombre
         super().save(*args, **kwargs)
 
+    @classmethod
+    def bulk_create_normalized(cls, entidades, **kwargs):
+        """bulk_create that fills normalized_name first (bulk_create skips save())."""
+        entidades = list(entidades)
+        for entidad in entidades:
+            entidad.normalized_name = normalize_entity_name(entidad.nombre)
+            entidad._normalized_nombre = entidad.nombre
+        return cls.objects.bulk_create(entidades, **kwargs)
+
     def __str__(self):
         return self.nombre
 
@@ -285,9 +512,39 @@ class NoticiaEntidad(models.Model):
 
     class Meta:
         unique_together = ("noticia", "entidad")
+        indexes = [
+            # Comfort feed: liked entities and noticias about them
+            models.Index(fields=['noticia', 'sentimiento']),
+            models.Index(fields=['entidad', 'sentimiento']),
+        ]
 
     def __str__(self):
-        return f"{self.noticia} - {self.entidad.nombre}"
+        noticia = (
+            self.noticia if NoticiaEntidad.noticia.is_cached(self)
+            else f"Noticia {self.noticia_id}"
+        )
+        entidad = (
+            self.entidad.nombre if NoticiaEntidad.entidad.is_cached(self)
+            else f"Entidad {self.entidad_id}"
+        )
+        return f"{noticia} - {entidad}"
+
+
+class VoterClusterRunManager(models.Manager):
+    def with_group_clusters(self):
+        """
+        Runs with their group clusters prefetched into run.group_clusters
+        (ordered by cluster_id, summary columns only), for pages listing runs.
+        """
+        return self.get_queryset().prefetch_related(
+            models.Prefetch(
+                'clusters',
+                queryset=VoterCluster.objects.filter(cluster_type='group')
+                .only('id', 'run', 'cluster_id', 'cluster_type', 'size', 'llm_name')
+                .order_by('cluster_id'),
+                to_attr='group_clusters',
+            )
+        )
 
 
 class VoterClusterRun(models.Model):
@@ -321,6 +578,8 @@ class VoterClusterRun(models.Model):
     )
     error_message = models.TextField(blank=True)
 
+    objects = VoterClusterRunManager()
+
     class Meta:
         ordering = ['-created_at']
         indexes = [
@@ -523,7 +782,23 @@ class VoterClusterMembership(models.Model):
         ]
 
     def __str__(self):
-        return f"{self.voter_type}:{self.voter_id} in cluster {self.cluster.cluster_id}"
+        # cluster_id here is the VoterCluster pk, not its run-local label
+        cluster = (
+            f"cluster {self.cluster.cluster_id}"
+            if VoterClusterMembership.cluster.is_cached(self)
+            else f"VoterCluster {self.cluster_id}"
+        )
+        return f"{self.voter_type}:{self.voter_id} in {cluster}"
+
+
+class ClusterVotingPatternManager(models.Manager):
+    def with_display(self):
+        """Patterns with cluster and noticia joined in, so __str__ shows labels."""
+        return (
+            self.get_queryset()
+            .select_related('cluster', 'noticia')
+            .defer('noticia__captured_html')
+        )
 
 
 class ClusterVotingPattern(models.Model):
@@ -545,24 +820,51 @@ class ClusterVotingPattern(models.Model):
         blank=True,
         help_text="Degree of agreement on this noticia (0-1)"
     )
-    majority_opinion = models.CharField(
-        max_length=10,
-        blank=True,
-        help_text="buena/mala/neutral"
+    # Derived from the counts by the database (ties: buena, then mala),
+    # so it can never disagree with them
+    majority_opinion = models.GeneratedField(
+        expression=models.Case(
+            models.When(
+                models.Q(count_buena__gte=models.F('count_mala'))
+                & models.Q(count_buena__gte=models.F('count_neutral')),
+                then=models.Value('buena'),
+            ),
+            models.When(
+                count_mala__gte=models.F('count_neutral'),
+                then=models.Value('mala'),
+            ),
+            default=models.Value('neutral'),
+        ),
+        output_field=models.CharField(max_length=10),
+        db_persist=True,
     )
 
+    objects = ClusterVotingPatternManager()
+
     class Meta:
         unique_together = [['cluster', 'noticia']]
         indexes = [
             models.Index(fields=['cluster', 'consensus_score']),
-            models.Index(fields=['cluster', 'majority_opinion']),
+            # Also serves (cluster, majority_opinion) lookups as a prefix
+            models.Index(
+                fields=['cluster', 'majority_opinion', 'consensus_score']
+            ),
         ]
 
     def __str__(self):
-        return (
-            f"Cluster {self.cluster.cluster_id} on {self.noticia.mostrar_titulo[:30]}: "
-            f"{self.majority_opinion or 'no consensus'}"
+        # Labels only when cluster/noticia are already loaded (see
+        # ClusterVotingPattern.objects.with_display()); ids otherwise
+        cluster = (
+            f"Cluster {self.cluster.cluster_id}"
+            if ClusterVotingPattern.cluster.is_cached(self)
+            else f"VoterCluster {self.cluster_id}"
+        )
+        noticia = (
+            self.noticia.mostrar_titulo[:30]
+            if ClusterVotingPattern.noticia.is_cached(self)
+            else f"Noticia {self.noticia_id}"
         )
+        return f"{cluster} on {noticia}: {self.majority_opinion}"
 
 
 class ClusterNameCache(models.Model):
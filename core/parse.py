@@ -1,8 +1,10 @@
 from typing import Optional, Literal, Union
+import hashlib
 import os
 from pydantic import BaseModel, Field
 from litellm import completion
 from bs4 import BeautifulSoup
+from django.core.cache import cache
 from core.url_requests import get
 import logging
 import litellm
@@ -396,6 +398,24 @@ def parse_from_meta_tags(url):
     return None, None, None
 
 
+META_TAGS_CACHE_TIMEOUT = 3600
+
+
+def parse_from_meta_tags_cached(url):
+    """
+    parse_from_meta_tags memoized in the shared cache for META_TAGS_CACHE_TIMEOUT,
+    so retries and repeated ingests of the same URL skip the HTTP fetches.
+    Failed fetches (nothing found) are not cached.
+    """
+    key = "meta_tags:" + hashlib.sha256(url.encode("utf-8")).hexdigest()
+    meta = cache.get(key)
+    if meta is None:
+        meta = parse_from_meta_tags(url)
+        if any(meta):
+            cache.set(key, meta, META_TAGS_CACHE_TIMEOUT)
+    return meta
+
+
 def generate_cluster_description(
     top_noticias: list[dict],
     entities_positive: list[dict],
@@ -1,13 +1,16 @@
 """
 Signal handlers for the core app.
-Handles vote reclaim when users login and user profile creation.
+Handles vote reclaim when users login, user profile creation and the
+denormalized vote counts on Noticia.
 """
 import logging
 from django.dispatch import receiver
-from django.db.models.signals import post_save
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save
 from django.contrib.auth.models import User
 from allauth.account.signals import user_logged_in
-from core.models import Voto, UserProfile
+from core.models import Noticia, Voto, UserProfile
 
 logger = logging.getLogger(__name__)
 
@@ -84,3 +87,35 @@ def create_user_profile(sender, instance, created, **kwargs):
     if created:
         UserProfile.objects.get_or_create(user=instance)
         logger.info(f"[Profile] Created profile for user: {instance.email}")
+
+
+def _bump_noticia_count(noticia_id, opinion, delta):
+    """Atomically add delta to the Noticia counter for opinion, floored at 0."""
+    field = f"count_{opinion}"
+    Noticia.objects.filter(pk=noticia_id).update(
+        **{field: Greatest(F(field) + delta, 0)}
+    )
+
+
+@receiver(post_save, sender=Voto)
+def count_saved_vote(sender, instance, created, raw=False, **kwargs):
+    """
+    Keep Noticia.count_* in step with a created or re-opinioned vote.
+    QuerySet.update() on opinion bypasses this; Noticia.recount_votes() repairs it.
+    """
+    if raw:
+        return
+    if created:
+        _bump_noticia_count(instance.noticia_id, instance.opinion, 1)
+    else:
+        previous = getattr(instance, "_stored_opinion", None)
+        if previous and previous != instance.opinion:
+            _bump_noticia_count(instance.noticia_id, previous, -1)
+            _bump_noticia_count(instance.noticia_id, instance.opinion, 1)
+    instance._stored_opinion = instance.opinion
+
+
+@receiver(post_delete, sender=Voto)
+def count_deleted_vote(sender, instance, **kwargs):
+    """Drop a deleted vote from its Noticia's count."""
+    _bump_noticia_count(instance.noticia_id, instance.opinion, -1)
@@ -22,6 +22,7 @@ from django.conf import settings
 from django.urls import reverse
 from functools import wraps
 from core.utils import make_reengagement_access_token
+from core.feeds import LATEST_CLUSTER_RUN_CACHE_KEY, get_puente_consensus_ids
 from core import url_requests
 from django.utils import timezone
 import time
@@ -220,7 +221,7 @@ def enrich_from_captured_html(noticia_id):
         noticia_id: ID of the Noticia to enrich
     """
     try:
-        noticia = Noticia.objects.get(id=noticia_id)
+        noticia = Noticia.objects.with_html().get(id=noticia_id)
 
         if not noticia.captured_html:
             logger.warning(f"No captured HTML for noticia {noticia_id}")
@@ -397,9 +398,9 @@ def update_voter_clusters(time_window_days=30, min_voters=10, min_votes_per_vote
         cluster_voters,
         group_clusters,
         create_subgroups,
-        compute_cluster_voting_aggregation,
+        compute_all_cluster_aggregations,
         compute_cluster_consensus,
-        compute_distance_to_centroid,
+        compute_distances_to_centroids,
         compute_silhouette_score,
     )
 
@@ -522,6 +523,9 @@ def update_voter_clusters(time_window_days=30, min_voters=10, min_votes_per_vote
         # 6.3: Save base cluster memberships
         base_cluster_obj_map = {c.cluster_id: c for c in base_cluster_objs}
         membership_objs = []
+        base_distances = compute_distances_to_centroids(
+            projections, base_centroids, base_labels
+        )
 
         for i in range(n_voters):
             cluster_id = int(base_labels[i])
@@ -529,16 +533,13 @@ def update_voter_clusters(time_window_days=30, min_voters=10, min_votes_per_vote
                 continue
 
             cluster_obj = base_cluster_obj_map[cluster_id]
-            distance = compute_distance_to_centroid(
-                projections[i], base_centroids[cluster_id]
-            )
 
             membership_objs.append(
                 VoterClusterMembership(
                     cluster=cluster_obj,
                     voter_type=voter_ids_list[i][0],
                     voter_id=voter_ids_list[i][1],
-                    distance_to_centroid=float(distance),
+                    distance_to_centroid=float(base_distances[i]),
                 )
             )
 
@@ -548,6 +549,9 @@ def update_voter_clusters(time_window_days=30, min_voters=10, min_votes_per_vote
         # 6.4: Compute and save voting patterns for base clusters
         logger.info("Computing cluster voting patterns")
         voting_pattern_objs = []
+        base_aggregations = compute_all_cluster_aggregations(
+            base_labels, vote_matrix, noticia_ids_list
+        )
 
         for cluster_id in range(k_base):
             cluster_mask = base_labels == cluster_id
@@ -561,13 +565,10 @@ def update_voter_clusters(time_window_days=30, min_voters=10, min_votes_per_vote
                 continue
 
             # Aggregate votes
-            aggregation = compute_cluster_voting_aggregation(
-                cluster_members, voter_ids_list, vote_matrix, noticia_ids_list
-            )
+            aggregation = base_aggregations.get(cluster_id, {})
 
             # Compute consensus
-            cluster_votes = {nid: agg for nid, agg in aggregation.items()}
-            consensus = compute_cluster_consensus(cluster_votes)
+            consensus = compute_cluster_consensus(aggregation)
 
             # Update cluster consensus score
             cluster_obj.consensus_score = float(consensus)
@@ -592,7 +593,6 @@ def update_voter_clusters(time_window_days=30, min_voters=10, min_votes_per_vote
                         count_mala=vote_agg.get("mala", 0),
                         count_neutral=vote_agg.get("neutral", 0),
                         consensus_score=float(noticia_consensus),
-                        majority_opinion=max_opinion,
                     )
                 )
 
@@ -601,6 +601,7 @@ def update_voter_clusters(time_window_days=30, min_voters=10, min_votes_per_vote
 
         # 6.5: Save group clusters
         group_cluster_objs = []
+        group_centroids = np.zeros((int(group_labels.max()) + 1, 2))
         for group_id in np.unique(group_labels):
             group_mask = group_labels == group_id
             group_projections = projections[group_mask]
@@ -610,6 +611,7 @@ def update_voter_clusters(time_window_days=30, min_voters=10, min_votes_per_vote
                 continue
 
             centroid = group_projections.mean(axis=0)
+            group_centroids[group_id] = centroid
 
             group_cluster_objs.append(
                 VoterCluster(
@@ -629,21 +631,22 @@ def update_voter_clusters(time_window_days=30, min_voters=10, min_votes_per_vote
         group_cluster_obj_map = {c.cluster_id: c for c in group_cluster_objs}
 
         group_membership_objs = []
+        group_distances = compute_distances_to_centroids(
+            projections, group_centroids, group_labels
+        )
         for i in range(n_voters):
             group_id = int(group_labels[i])
             if group_id not in group_cluster_obj_map:
                 continue
 
             cluster_obj = group_cluster_obj_map[group_id]
-            group_centroid = projections[group_labels == group_id].mean(axis=0)
-            distance = compute_distance_to_centroid(projections[i], group_centroid)
 
             group_membership_objs.append(
                 VoterClusterMembership(
                     cluster=cluster_obj,
                     voter_type=voter_ids_list[i][0],
                     voter_id=voter_ids_list[i][1],
-                    distance_to_centroid=float(distance),
+                    distance_to_centroid=float(group_distances[i]),
                 )
             )
 
@@ -652,6 +655,9 @@ def update_voter_clusters(time_window_days=30, min_voters=10, min_votes_per_vote
 
         # 6.7: Compute voting patterns for group clusters
         group_voting_pattern_objs = []
+        group_aggregations = compute_all_cluster_aggregations(
+            group_labels, vote_matrix, noticia_ids_list
+        )
         for group_id in np.unique(group_labels):
             if group_id not in group_cluster_obj_map:
                 continue
@@ -663,9 +669,7 @@ def update_voter_clusters(time_window_days=30, min_voters=10, min_votes_per_vote
             if len(cluster_members) == 0:
                 continue
 
-            vote_agg = compute_cluster_voting_aggregation(
-                cluster_members, voter_ids_list, vote_matrix, noticia_ids_list
-            )
+            vote_agg = group_aggregations.get(int(group_id), {})
 
             # Debug: log if aggregation is empty
             if len(vote_agg) == 0 and len(cluster_members) > 0:
@@ -676,8 +680,7 @@ def update_voter_clusters(time_window_days=30, min_voters=10, min_votes_per_vote
                 )
 
             # Compute consensus for the group cluster
-            cluster_votes = {nid: agg for nid, agg in vote_agg.items()}
-            consensus = compute_cluster_consensus(cluster_votes)
+            consensus = compute_cluster_consensus(vote_agg)
 
             # Update cluster consensus score
             cluster_obj.consensus_score = float(consensus)
@@ -699,7 +702,6 @@ def update_voter_clusters(time_window_days=30, min_voters=10, min_votes_per_vote
                         count_mala=agg["mala"],
                         count_neutral=agg.get("neutral", 0),
                         consensus_score=float(noticia_consensus),
-                        majority_opinion=max_opinion,
                     )
                 )
 
@@ -780,6 +782,18 @@ def update_voter_clusters(time_window_days=30, min_voters=10, min_votes_per_vote
         )
         run.save()
 
+        # Feeds now have a newer run to personalize from; warm its bridge
+        # feed order in the background so the first request does not pay
+        # for it. The run is already completed: a cache or broker hiccup
+        # here must not mark it failed.
+        try:
+            cache.delete(LATEST_CLUSTER_RUN_CACHE_KEY)
+            warm_puente_consensus.delay(run.id)
+        except Exception:
+            logger.exception(
+                f"Could not refresh feed caches for cluster run {run.id}"
+            )
+
         # Invalidate old report snapshots since we have a new clustering run
         # The new snapshot will be generated by the hourly task
         logger.info("Invalidating old cluster report snapshots")
@@ -825,6 +839,23 @@ def update_voter_clusters(time_window_days=30, min_voters=10, min_votes_per_vote
         raise
 
 
+@shared_task
+def warm_puente_consensus(run_id):
+    """
+    Compute and cache the bridge feed's consensus order for a cluster run.
+
+    Queued by update_voter_clusters once the run is completed, so the
+    consensus pass (every Voto, one Noticia per candidate) runs outside
+    the clustering task.
+    """
+    try:
+        run = VoterClusterRun.objects.get(id=run_id)
+    except VoterClusterRun.DoesNotExist:
+        logger.warning(f"Cluster run {run_id} not found, nothing to warm")
+        return None
+    return len(get_puente_consensus_ids(run))
+
+
 @shared_task
 @task_lock(timeout=60 * 30)  # 30 min lock
 def send_reengagement_emails(
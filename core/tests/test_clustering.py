@@ -4,7 +4,7 @@ Tests for voter clustering functionality.
 
 import pytest
 import numpy as np
-from scipy.sparse import lil_matrix
+from scipy.sparse import csr_matrix, lil_matrix
 from django.contrib.auth.models import User
 from core.models import Noticia, Voto, VoterClusterRun
 from core.clustering import (
@@ -14,9 +14,16 @@ from core.clustering import (
     group_clusters,
     compute_cluster_consensus,
     compute_voter_similarity,
+    voter_votes_to_arrays,
     compute_cluster_entities,
     compute_cluster_voting_aggregation,
 )
+from core.clustering.matrix_builder import (
+    VOTE_BUENA,
+    VOTE_MALA,
+    VOTE_NEUTRAL,
+    opinion_values,
+)
 
 
 @pytest.fixture
@@ -68,13 +75,13 @@ def test_build_vote_matrix(sample_votes):
     assert len(voter_ids) == 3
     assert len(noticia_ids) == 3
 
-    # Check vote encoding (buena=1, neutral=0.0001, mala=-1)
-    # User1's votes should be [1, 1, -1]
-    # User2's votes should be [1, -1, -1]
-    # Session1's votes should be [0.0001, 0.0001, 0.0001]
-    # Note: neutral votes now use epsilon (0.0001) so they're stored in sparse matrix
+    # Check vote encoding (buena=2, neutral=1, mala=-2)
+    # User1's votes should be [2, 2, -2]
+    # User2's votes should be [2, -2, -2]
+    # Session1's votes should be [1, 1, 1]
+    # Note: neutral votes use a non-zero code so they're stored in sparse matrix
     # So nnz will be 9 (all votes stored, including neutral)
-    assert vote_matrix.nnz == 9  # All votes stored (including neutral with epsilon)
+    assert vote_matrix.nnz == 9  # All votes stored (including neutral)
 
 
 def test_compute_sparsity_aware_pca():
@@ -82,14 +89,16 @@ def test_compute_sparsity_aware_pca():
     # Create small test matrix
     n_voters = 10
     n_noticias = 5
-    vote_matrix = lil_matrix((n_voters, n_noticias), dtype=np.float32)
+    vote_matrix = lil_matrix((n_voters, n_noticias), dtype=np.int8)
 
     # Fill with random votes
     np.random.seed(42)
     for i in range(n_voters):
         for j in range(n_noticias):
             if np.random.rand() > 0.3:  # 70% density
-                vote_matrix[i, j] = np.random.choice([-1, 0, 1])
+                vote_matrix[i, j] = np.random.choice(
+                    [VOTE_MALA, VOTE_NEUTRAL, VOTE_BUENA]
+                )
 
     pca_result = compute_sparsity_aware_pca(vote_matrix, n_components=2)
 
@@ -102,6 +111,25 @@ def test_compute_sparsity_aware_pca():
     assert all(pca_result["voter_vote_counts"] > 0)
 
 
+def test_pca_matches_dense_centered_svd():
+    """Implicit centering must match an SVD of the explicitly centered matrix."""
+    rng = np.random.default_rng(0)
+    codes = rng.choice([0, VOTE_MALA, VOTE_NEUTRAL, VOTE_BUENA], size=(30, 12))
+    vote_matrix = csr_matrix(codes.astype(np.int8))
+
+    pca_result = compute_sparsity_aware_pca(vote_matrix, n_components=2)
+
+    values = opinion_values(codes).astype(np.float64)
+    centered = values - values.mean(axis=0)
+    S = np.linalg.svd(centered, compute_uv=False)
+
+    # The SVD runs in float32
+    np.testing.assert_allclose(pca_result["singular_values"], S[:2], rtol=1e-5)
+    np.testing.assert_allclose(
+        pca_result["variance_explained"], S[:2] ** 2 / np.sum(S ** 2), rtol=1e-5
+    )
+
+
 def test_cluster_voters():
     """Test k-means clustering."""
     # Create simple 2D projections
@@ -158,34 +186,66 @@ def test_compute_cluster_consensus():
     # Consensus = avg((4/10), (4/10)) = 0.4
     assert 0.3 <= consensus <= 0.5  # Should be low
 
+    # Array layout [buena, mala, neutral] gives the same score
+    counts = np.array([[3, 4, 3], [4, 3, 3], [0, 0, 0]])
+    assert compute_cluster_consensus(counts) == pytest.approx(consensus)
+
 
 def test_compute_voter_similarity():
     """Test voter similarity calculation."""
     # Identical votes
     voter_a = {1: "buena", 2: "buena", 3: "mala"}
     voter_b = {1: "buena", 2: "buena", 3: "mala"}
-    similarity = compute_voter_similarity(voter_a, voter_b)
+    similarity = compute_voter_similarity(
+        voter_votes_to_arrays(voter_a), voter_votes_to_arrays(voter_b)
+    )
     assert similarity == 1.0
 
     # Complete disagreement
     voter_a = {1: "buena", 2: "buena", 3: "buena"}
     voter_b = {1: "mala", 2: "mala", 3: "mala"}
-    similarity = compute_voter_similarity(voter_a, voter_b)
+    similarity = compute_voter_similarity(
+        voter_votes_to_arrays(voter_a), voter_votes_to_arrays(voter_b)
+    )
     assert similarity == 0.0
 
     # Partial agreement
     voter_a = {1: "buena", 2: "buena", 3: "mala"}
     voter_b = {1: "buena", 2: "mala", 3: "mala"}
-    similarity = compute_voter_similarity(voter_a, voter_b)
+    similarity = compute_voter_similarity(
+        voter_votes_to_arrays(voter_a), voter_votes_to_arrays(voter_b)
+    )
     assert similarity == 2 / 3  # 2 out of 3 agree
 
     # No overlap
     voter_a = {1: "buena", 2: "buena"}
     voter_b = {3: "mala", 4: "mala"}
-    similarity = compute_voter_similarity(voter_a, voter_b)
+    similarity = compute_voter_similarity(
+        voter_votes_to_arrays(voter_a), voter_votes_to_arrays(voter_b)
+    )
     assert similarity is None
 
 
+def test_distances_to_centroids_match_scalar_distance():
+    """Vectorized distances agree with the per-voter distance helper."""
+    from core.clustering import (
+        compute_distance_to_centroid,
+        compute_distances_to_centroids,
+    )
+
+    projections = np.array([[0.0, 0.0], [3.0, 4.0], [1.0, 1.0]])
+    centroids = np.array([[0.0, 0.0], [1.0, 1.0]])
+    labels = np.array([0, 0, 1])
+
+    distances = compute_distances_to_centroids(projections, centroids, labels)
+
+    assert distances.tolist() == [0.0, 5.0, 0.0]
+    for i, label in enumerate(labels):
+        assert distances[i] == compute_distance_to_centroid(
+            projections[i], centroids[label]
+        )
+
+
 def test_voter_cluster_run_creation(db):
     """Test VoterClusterRun model."""
     run = VoterClusterRun.objects.create(
@@ -350,9 +410,9 @@ def test_compute_cluster_entities():
 
 
 @pytest.mark.django_db
-def test_neutral_votes_stored_with_epsilon():
+def test_neutral_votes_stored_with_nonzero_code():
     """
-    Test that neutral votes are stored with epsilon (0.0001) in sparse matrix.
+    Test that neutral votes are stored with a non-zero code in sparse matrix.
     This allows distinguishing between explicit neutral votes and missing votes.
     """
 
@@ -374,12 +434,16 @@ def test_neutral_votes_stored_with_epsilon():
     assert len(noticia_ids) == 1
 
     # Neutral vote should be stored (not missing)
-    assert vote_matrix.nnz == 1  # One non-zero entry (the epsilon)
+    assert vote_matrix.nnz == 1  # One stored entry (the neutral code)
+
+    # Check that the value is the neutral code
+    assert vote_matrix[0, 0] == VOTE_NEUTRAL
 
-    # Check that the value is epsilon (0.0001)
-    NEUTRAL_EPSILON = 0.0001
-    stored_value = vote_matrix[0, 0]
-    assert abs(stored_value - NEUTRAL_EPSILON) < 1e-10
+
+def test_opinion_values_maps_codes_to_pca_values():
+    """Opinion codes map to +1/0/-1, and missing cells stay at 0."""
+    codes = np.array([VOTE_BUENA, VOTE_NEUTRAL, VOTE_MALA, 0], dtype=np.int8)
+    assert opinion_values(codes).tolist() == [1, 0, -1, 0]
 
 
 @pytest.mark.django_db
@@ -428,12 +492,12 @@ def test_missing_votes_not_stored_in_matrix():
     noticia2_idx = noticia_ids.index(noticia2.id)
 
     # User1 should have votes on both
-    assert vote_matrix[user1_idx, noticia1_idx] == 1.0  # buena
-    assert vote_matrix[user1_idx, noticia2_idx] == -1.0  # mala
+    assert vote_matrix[user1_idx, noticia1_idx] == VOTE_BUENA
+    assert vote_matrix[user1_idx, noticia2_idx] == VOTE_MALA
 
     # User2 should have vote on noticia1 only
-    assert vote_matrix[user2_idx, noticia1_idx] == 1.0  # buena
-    # User2's vote on noticia2 should be missing (0.0 after toarray, but not stored)
+    assert vote_matrix[user2_idx, noticia1_idx] == VOTE_BUENA
+    # User2's vote on noticia2 should be missing (0 after toarray, but not stored)
     # Check that it's not in the sparse structure
     vote_matrix_csr = vote_matrix.tocsr()
     column = vote_matrix_csr[:, noticia2_idx]
@@ -582,10 +646,10 @@ def test_aggregation_only_counts_explicit_votes():
 
 
 @pytest.mark.django_db
-def test_pca_handles_epsilon_correctly():
+def test_pca_handles_neutral_code_correctly():
     """
-    Test that PCA correctly handles epsilon values for neutral votes,
-    converting them back to 0.0 for mean-centering.
+    Test that PCA correctly handles the neutral vote code,
+    converting it to 0.0 for mean-centering.
     """
     user1 = User.objects.create_user("user1", "user1@test.com", "pass")
     user2 = User.objects.create_user("user2", "user2@test.com", "pass")
@@ -807,6 +871,46 @@ def test_aggregation_with_shared_noticias():
     assert agg2["total"] == 5
 
 
+def test_aggregation_requires_compressed_sparse_matrix():
+    """Aggregation rejects sparse formats that would need a per-call conversion."""
+    vote_matrix = lil_matrix((2, 2), dtype=np.int8)
+    vote_matrix[0, 0] = VOTE_BUENA
+
+    with pytest.raises(ValueError):
+        compute_cluster_voting_aggregation(
+            np.array([0, 1]), [], vote_matrix, [10, 20]
+        )
+
+    aggregation = compute_cluster_voting_aggregation(
+        np.array([0, 1]), [], vote_matrix.tocsr(), [10, 20]
+    )
+    assert aggregation == {10: {"buena": 1, "mala": 0, "neutral": 0, "total": 1}}
+
+
+def test_all_cluster_aggregations_match_per_cluster_aggregation():
+    """Batched aggregation returns the same counts as one call per cluster."""
+    from scipy.sparse import random as sparse_random
+    from core.clustering import compute_all_cluster_aggregations
+
+    rng = np.random.default_rng(0)
+    vote_matrix = sparse_random(
+        30, 8, density=0.4, format="csr", random_state=0,
+        data_rvs=lambda n: rng.choice([VOTE_MALA, VOTE_NEUTRAL, VOTE_BUENA], n),
+        dtype=np.int8,
+    )
+    noticia_ids = list(range(100, 108))
+    labels = rng.integers(0, 4, size=30)
+
+    aggregations = compute_all_cluster_aggregations(labels, vote_matrix, noticia_ids)
+
+    for label in np.unique(labels):
+        members = np.where(labels == label)[0]
+        expected = compute_cluster_voting_aggregation(
+            members, [], vote_matrix, noticia_ids
+        )
+        assert aggregations[int(label)] == expected
+
+
 # ============================================================================
 # Tests for ClusterNameCache (LLM name caching with TTL)
 # ============================================================================
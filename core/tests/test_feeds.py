@@ -7,6 +7,7 @@ no request/response.
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 
 from core.models import (
     Noticia,
@@ -25,13 +26,20 @@ from core.feeds import (
     FEED_AVANZADO,
     DEFAULT_FEED,
     COMFORT_CLUSTER_CONSENSUS_MIN,
+    LATEST_CLUSTER_RUN_CACHE_KEY,
     filter_recientes,
+    get_cluster_member_keys,
+    get_latest_cluster_run,
+    get_puente_consensus_ids,
     get_confort_noticia_ids,
     get_puente_ordered_noticia_ids,
 )
 
 User = get_user_model()
 
+# The latest cluster run is cached; isolate each test from the others
+pytestmark = pytest.mark.usefixtures("locmem_cache")
+
 
 # ---- filter_recientes ----
 
@@ -175,6 +183,34 @@ class TestGetConfortNoticiaIds:
         result = get_confort_noticia_ids("user", str(user.id), lookup)
         assert result is None
 
+    def test_singleton_cluster_skips_peer_lookup(self, user, cluster_run_with_members):
+        run, cluster, other_user = cluster_run_with_members
+        cluster.size = 1
+        cluster.save()
+        n = Noticia.objects.create(enlace="https://example.com/solo")
+        Voto.objects.create(usuario=other_user, noticia=n, opinion="buena")
+        result = get_confort_noticia_ids("user", str(user.id), {"usuario": user})
+        assert result is None
+
+    def test_skips_malformed_user_member_ids(self, user, cluster_run_with_members):
+        run, cluster, other_user = cluster_run_with_members
+        VoterClusterMembership.objects.create(
+            cluster=cluster, voter_type="user", voter_id="not-a-number"
+        )
+        n = Noticia.objects.create(enlace="https://example.com/peer")
+        Voto.objects.create(usuario=other_user, noticia=n, opinion="buena")
+        result = get_confort_noticia_ids("user", str(user.id), {"usuario": user})
+        assert result == {n.id}
+
+    def test_cluster_member_keys_cached(self, user, cluster_run_with_members, django_assert_num_queries):
+        _, cluster, other_user = cluster_run_with_members
+        expected = {("user", str(user.id)), ("user", str(other_user.id))}
+        assert set(get_cluster_member_keys(cluster)) == expected
+
+        VoterClusterMembership.objects.filter(cluster=cluster).delete()
+        with django_assert_num_queries(0):
+            assert set(get_cluster_member_keys(cluster)) == expected
+
 
 @pytest.fixture
 def user(db):
@@ -208,6 +244,39 @@ def cluster_run_with_members(db, user):
     return run, cluster, other_user
 
 
+# ---- get_latest_cluster_run ----
+
+
+@pytest.mark.django_db
+class TestGetLatestClusterRun:
+    """Tests for the cached latest-completed-run lookup shared by the feeds."""
+
+    def test_returns_none_without_completed_run(self):
+        VoterClusterRun.objects.create(status="running")
+        assert get_latest_cluster_run() is None
+
+    def test_absence_cached_until_invalidated(self, django_assert_num_queries):
+        assert get_latest_cluster_run() is None
+
+        run = VoterClusterRun.objects.create(status="completed")
+        with django_assert_num_queries(0):
+            assert get_latest_cluster_run() is None
+
+        cache.delete(LATEST_CLUSTER_RUN_CACHE_KEY)
+        assert get_latest_cluster_run().id == run.id
+
+    def test_cached_until_invalidated(self, django_assert_num_queries):
+        first = VoterClusterRun.objects.create(status="completed")
+        assert get_latest_cluster_run().id == first.id
+
+        newer = VoterClusterRun.objects.create(status="completed")
+        with django_assert_num_queries(0):
+            assert get_latest_cluster_run().id == first.id
+
+        cache.delete(LATEST_CLUSTER_RUN_CACHE_KEY)
+        assert get_latest_cluster_run().id == newer.id
+
+
 # ---- get_puente_ordered_noticia_ids ----
 
 
@@ -245,6 +314,29 @@ class TestGetPuenteOrderedNoticiaIds:
         # noticia2 might be in result (depending on consensus)
         assert isinstance(result, list)
 
+    def test_consensus_order_cached_per_run(self, puente_two_cluster_run, django_assert_num_queries):
+        run, noticia1, noticia2, voter = puente_two_cluster_run
+        kwargs = {"consensus_threshold": 0.5, "min_votes_per_cluster": 1}
+        ordered = get_puente_consensus_ids(run, **kwargs)
+        assert set(ordered) == {noticia1.id, noticia2.id}
+
+        with django_assert_num_queries(0):
+            assert get_puente_consensus_ids(run, **kwargs) == ordered
+
+        # Voter exclusion is applied on top of the cached order
+        Voto.objects.create(usuario=voter, noticia=noticia1, opinion="buena")
+        result = get_puente_ordered_noticia_ids({"usuario": voter}, **kwargs)
+        assert result == [nid for nid in ordered if nid != noticia1.id]
+
+    def test_warm_task_fills_consensus_cache(self, puente_two_cluster_run, django_assert_num_queries):
+        from core.tasks import warm_puente_consensus
+
+        run, noticia1, noticia2, voter = puente_two_cluster_run
+        assert warm_puente_consensus(run.id) == len(get_puente_consensus_ids(run))
+
+        with django_assert_num_queries(0):
+            get_puente_consensus_ids(run)
+
 
 @pytest.fixture
 def puente_two_cluster_run(db):
@@ -1,9 +1,24 @@
+import unicodedata
+from io import StringIO
+from unittest.mock import patch
+
 import pytest
 from django.contrib.auth.models import User
+from django.core.management import call_command
 from django.db import IntegrityError
-from django.urls import reverse
+from django.urls import get_script_prefix, reverse, set_script_prefix
+from django.utils.text import slugify
 
-from core.models import Entidad, normalize_entity_name
+from core.models import (
+    ClusterVotingPattern,
+    Entidad,
+    Noticia,
+    VoterCluster,
+    VoterClusterRun,
+    Voto,
+    normalize_entity_name,
+    slugify_title,
+)
 
 @pytest.mark.django_db
 class TestUserModel:
@@ -70,6 +85,21 @@ class TestEntidadNormalization:
     def test_normalize_entity_name_strips_whitespace(self):
         assert normalize_entity_name("  Luis  ") == "luis"
 
+    def test_normalize_entity_name_falls_back_outside_accent_table(self):
+        # Not in the translate table: handled by the NFKD slow path
+        assert normalize_entity_name("Dvořák") == "dvorak"
+        assert normalize_entity_name("Façade Über") == "facade uber"
+
+    def test_normalize_entity_name_folds_compatibility_forms(self):
+        # Full-width letters and ligatures dedupe with their plain forms
+        assert normalize_entity_name("Ｆｒｅｎｔｅ Ａｍｐｌｉｏ") == "frente amplio"
+        assert normalize_entity_name("ﬁat") == normalize_entity_name("Fiat")
+        assert normalize_entity_name("ℒℒC") == "llc"
+
+    def test_normalize_entity_name_recomposes_after_stripping(self):
+        # Hangul decomposes to jamo under NFKD; stored names stay composed
+        assert normalize_entity_name("서울") == unicodedata.normalize("NFC", "서울")
+
     def test_entidad_saves_normalized_name(self):
         e = Entidad.objects.create(nombre="José Mujica", tipo="persona")
         assert e.normalized_name == "jose mujica"
@@ -83,3 +113,253 @@ class TestEntidadNormalization:
         e1 = Entidad.objects.create(nombre="Montevideo", tipo="lugar")
         e2 = Entidad.objects.create(nombre="Montevideo", tipo="organizacion")
         assert e1.pk != e2.pk
+
+    def test_entidad_renormalizes_when_nombre_changes(self):
+        e = Entidad.objects.create(nombre="José Mujica", tipo="persona")
+        e = Entidad.objects.get(pk=e.pk)
+        e.nombre = "Lucía Topolansky"
+        e.save()
+        assert Entidad.objects.get(pk=e.pk).normalized_name == "lucia topolansky"
+
+    def test_entidad_bulk_create_normalized(self):
+        created = Entidad.bulk_create_normalized(
+            [Entidad(nombre="Ñandú", tipo="otro"), Entidad(nombre=" Río ", tipo="lugar")]
+        )
+        assert [e.normalized_name for e in created] == ["nandu", "rio"]
+        assert set(Entidad.objects.values_list("normalized_name", flat=True)) == {"nandu", "rio"}
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("locmem_cache")
+class TestNoticiaMeta:
+    """Meta tag refresh writes only the fetched fields."""
+
+    def test_update_meta_from_url_saves_changed_fields(self):
+        noticia = Noticia.objects.create(
+            enlace="https://example.com/meta", meta_descripcion="Original"
+        )
+        with patch(
+            "core.models.parse.parse_from_meta_tags",
+            return_value=("Nuevo título", "https://example.com/img.jpg", None),
+        ):
+            noticia.update_meta_from_url()
+
+        noticia.refresh_from_db()
+        assert noticia.meta_titulo == "Nuevo título"
+        assert noticia.meta_imagen == "https://example.com/img.jpg"
+        assert noticia.meta_descripcion == "Original"
+
+    def test_bulk_update_meta(self):
+        noticias = [
+            Noticia.objects.create(enlace=f"https://example.com/bulk/{i}")
+            for i in range(3)
+        ]
+        with patch(
+            "core.models.parse.parse_from_meta_tags",
+            side_effect=lambda url: (f"Título {url[-1]}", None, "Desc"),
+        ):
+            Noticia.bulk_update_meta(Noticia.objects.filter(pk__in=[n.pk for n in noticias]), batch_size=2)
+
+        for i, n in enumerate(noticias):
+            n.refresh_from_db()
+            assert n.meta_titulo == f"Título {i}"
+            assert n.meta_descripcion == "Desc"
+            assert n.meta_imagen is None
+
+    def test_meta_fetch_cached_per_url(self):
+        noticia = Noticia.objects.create(enlace="https://example.com/cached")
+        meta = ("Título", None, None)
+        with patch(
+            "core.models.parse.parse_from_meta_tags", return_value=meta
+        ) as fetch:
+            noticia.update_meta_from_url()
+            noticia.update_meta_from_url()
+            assert fetch.call_count == 1
+
+            noticia.update_meta_from_url(refresh=True)
+            assert fetch.call_count == 2
+
+
+@pytest.mark.django_db
+class TestNoticiaSlug:
+    """Slug generation on save."""
+
+    def test_colliding_titles_get_first_free_suffix(self):
+        slugs = [
+            Noticia.objects.create(
+                enlace=f"https://example.com/slug/{i}", meta_titulo="Misma Noticia"
+            ).slug
+            for i in range(3)
+        ]
+        assert slugs == ["misma-noticia", "misma-noticia-1", "misma-noticia-2"]
+
+    def test_existing_slugs_like_only_counts_numeric_suffixes(self):
+        for i, titulo in enumerate(
+            ["Lluvia", "Lluvia", "Lluvia fuerte", "Lluvia 2024", "Sol"]
+        ):
+            Noticia.objects.create(
+                enlace=f"https://example.com/like/{i}", meta_titulo=titulo
+            )
+
+        with patch("core.models.SLUG_LOOKUP_BATCH_SIZE", 1):
+            found = Noticia.existing_slugs_like(["lluvia", "sol", "nieve"])
+        # "lluvia-2024" is its own title's slug, but also reads as lluvia-N
+        assert found == {"lluvia", "lluvia-1", "lluvia-2024", "sol"}
+
+    def test_retries_when_slug_taken_concurrently(self):
+        Noticia.objects.create(enlace="https://example.com/race/1", meta_titulo="Carrera")
+        # First lookup misses the row a concurrent submit just inserted
+        with patch.object(
+            Noticia,
+            "existing_slugs_like",
+            side_effect=[set(), {"carrera"}],
+        ):
+            noticia = Noticia.objects.create(
+                enlace="https://example.com/race/2", meta_titulo="Carrera"
+            )
+        assert noticia.slug == "carrera-1"
+
+    def test_populate_slugs_writes_each_chunk(self):
+        noticias = [
+            Noticia.objects.create(
+                enlace=f"https://example.com/populate/{i}", meta_titulo="Repetida"
+            )
+            for i in range(3)
+        ]
+        Noticia.objects.filter(pk__in=[n.pk for n in noticias]).update(slug=None)
+
+        out = StringIO()
+        with patch(
+            "core.management.commands.populate_slugs.SLUG_CHUNK_SIZE", 1
+        ), patch.object(
+            Noticia.objects, "bulk_update", wraps=Noticia.objects.bulk_update
+        ) as bulk_update:
+            call_command("populate_slugs", stdout=out)
+
+        assert bulk_update.call_count == 3
+        assert [Noticia.objects.get(pk=n.pk).slug for n in noticias] == [
+            "repetida", "repetida-1", "repetida-2"
+        ]
+        assert "for 3 noticias" in out.getvalue()
+
+
+@pytest.mark.django_db
+class TestNoticiaVoteCounts:
+    """Denormalized count_* columns follow Voto writes."""
+
+    def _counts(self, noticia):
+        noticia.refresh_from_db()
+        return (noticia.count_buena, noticia.count_mala, noticia.count_neutral)
+
+    def test_create_change_and_delete_move_counts(self):
+        noticia = Noticia.objects.create(enlace="https://example.com/counts/1")
+        Voto.objects.create(noticia=noticia, session_key="a", opinion="buena")
+        Voto.objects.create(noticia=noticia, session_key="b", opinion="buena")
+        assert self._counts(noticia) == (2, 0, 0)
+
+        Voto.objects.update_or_create(
+            noticia=noticia, session_key="a", defaults={"opinion": "mala"}
+        )
+        assert self._counts(noticia) == (1, 1, 0)
+
+        Voto.objects.get(noticia=noticia, session_key="b").delete()
+        assert self._counts(noticia) == (0, 1, 0)
+
+    def test_recount_votes_repairs_drift(self):
+        noticia = Noticia.objects.create(enlace="https://example.com/counts/2")
+        Voto.objects.create(noticia=noticia, session_key="a", opinion="neutral")
+        Voto.objects.filter(noticia=noticia).update(opinion="mala")
+        assert self._counts(noticia) == (0, 0, 1)
+
+        Noticia.recount_votes()
+        assert self._counts(noticia) == (0, 1, 0)
+
+    def test_delete_after_counter_zeroed_stays_at_zero(self):
+        noticia = Noticia.objects.create(enlace="https://example.com/counts/3")
+        voto = Voto.objects.create(noticia=noticia, session_key="a", opinion="buena")
+        Noticia.objects.filter(pk=noticia.pk).update(count_buena=0)
+
+        voto.delete()
+        assert self._counts(noticia) == (0, 0, 0)
+
+
+@pytest.mark.django_db
+def test_get_absolute_url_follows_script_prefix():
+    noticia = Noticia.objects.create(
+        enlace="https://example.com/url/1", meta_titulo="Una Noticia"
+    )
+    plain = noticia.get_absolute_url()
+    previous = get_script_prefix()
+    set_script_prefix("/sub/")
+    try:
+        assert noticia.get_absolute_url() == "/sub" + plain
+    finally:
+        set_script_prefix(previous)
+
+
+@pytest.mark.django_db
+def test_noticia_manager_defers_captured_html():
+    created = Noticia.objects.create(
+        enlace="https://example.com/html/1", captured_html="<html>x</html>"
+    )
+
+    assert Noticia.objects.get(pk=created.pk).get_deferred_fields() == {
+        "captured_html"
+    }
+    with_html = Noticia.objects.with_html().get(pk=created.pk)
+    assert with_html.get_deferred_fields() == set()
+    assert with_html.captured_html == "<html>x</html>"
+
+
+@pytest.mark.django_db
+def test_voto_str_uses_ids_unless_related_loaded(django_assert_num_queries):
+    user = User.objects.create_user(username="votante", password="x")
+    noticia = Noticia.objects.create(
+        enlace="https://example.com/str/1", meta_titulo="Titulo"
+    )
+    Voto.objects.create(usuario=user, noticia=noticia, opinion="buena")
+
+    plain = Voto.objects.get()
+    with django_assert_num_queries(0):
+        assert str(plain) == f"User-{user.id} - buena - Noticia {noticia.id}"
+
+    displayed = Voto.objects.with_display().get()
+    with django_assert_num_queries(0):
+        assert str(displayed) == "votante - buena - Titulo"
+
+
+@pytest.mark.django_db
+def test_cluster_voting_pattern_majority_follows_counts():
+    run = VoterClusterRun.objects.create(status="completed")
+    cluster = VoterCluster.objects.create(
+        run=run, cluster_id=0, cluster_type="group", size=3,
+        centroid_x=0.0, centroid_y=0.0,
+    )
+    noticia = Noticia.objects.create(enlace="https://example.com/majority/1")
+    pattern = ClusterVotingPattern.objects.create(
+        cluster=cluster, noticia=noticia,
+        count_buena=1, count_mala=3, count_neutral=3,
+    )
+
+    pattern.refresh_from_db()
+    assert pattern.majority_opinion == "mala"
+
+    ClusterVotingPattern.objects.filter(pk=pattern.pk).update(count_neutral=4)
+    pattern.refresh_from_db()
+    assert pattern.majority_opinion == "neutral"
+
+
+@pytest.mark.parametrize(
+    "title",
+    [
+        "Misma Noticia",
+        "¿Qué pasó en la Intendencia de Montevideo?",
+        "Peñarol vs. Nacional: 2-1 — crónica",
+        "  don't   panic__ ",
+        "Ｆｕｌｌ ｗｉｄｔｈ ﬁnal",
+        "São Paulo e Açores",
+        "",
+    ],
+)
+def test_slugify_title_matches_django_slugify(title):
+    assert slugify_title(title) == slugify(title)
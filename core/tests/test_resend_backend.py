@@ -11,8 +11,10 @@ def test_send_messages_with_resend(monkeypatch, settings):
 
     sent_payloads = []
 
-    def fake_post(url, json, headers, timeout):
-        sent_payloads.append({"url": url, "json": json, "headers": headers})
+    def fake_post(session, url, json, timeout):
+        sent_payloads.append(
+            {"url": url, "json": json, "headers": dict(session.headers)}
+        )
 
         class Response:
             status_code = 200
@@ -23,7 +25,9 @@ def test_send_messages_with_resend(monkeypatch, settings):
 
         return Response()
 
-    monkeypatch.setattr("core.email_backends.resend.requests.post", fake_post)
+    monkeypatch.setattr(
+        "core.email_backends.resend.requests.Session.post", fake_post
+    )
 
     message = EmailMessage(
         subject="Hello",
@@ -36,8 +40,10 @@ def test_send_messages_with_resend(monkeypatch, settings):
     )
     message.attach("hello.txt", "hi", "text/plain")
 
-    assert backend.send_messages([message]) == 1
-    assert len(sent_payloads) == 1
+    assert backend.send_messages([message, message]) == 2
+    assert len(sent_payloads) == 2
+    assert sent_payloads[0]["headers"]["Authorization"] == "Bearer test-key"
+    assert backend.session is None
     payload = sent_payloads[0]["json"]
     assert payload["from"] == "sender@example.com"
     assert payload["to"] == ["dest@example.com"]
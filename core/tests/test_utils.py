@@ -76,11 +76,13 @@ class TestNormalizeUrl:
         result = normalize_url(malformed)
         assert result == malformed
     
-    def test_preserves_case_in_domain(self):
-        """Should preserve the domain case (though browsers normalize it)."""
-        url = "https://Example.COM/article?utm_source=test"
-        result = normalize_url(url)
-        assert result.startswith("https://Example.COM/")
+    def test_lowercases_domain_but_not_path(self):
+        """Should lowercase the host (case-insensitive) and keep path case."""
+        url = "https://Example.COM/Article?utm_source=test"
+        assert normalize_url(url) == "https://example.com/Article"
+        assert normalize_url("https://Example.com/a") == normalize_url(
+            "https://example.com/a"
+        )
     
     def test_sorts_params_for_consistency(self):
         """Should sort parameters for consistent output."""
@@ -26,8 +26,24 @@ class TestViews:
         response = authenticated_client.get(url)
         assert response.status_code == 302  # Redirect to login page
 
+    def test_admin_voto_changelist_skips_captured_html(self, admin_client):
+        """The Voto changelist joins noticia without its captured HTML."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        noticia = Noticia.objects.create(
+            enlace='https://example.com/admin-voto', captured_html='<html></html>'
+        )
+        Voto.objects.create(noticia=noticia, session_key='s' * 40, opinion='buena')
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = admin_client.get(reverse('admin:core_voto_changelist'))
+        assert response.status_code == 200
+        assert not any('captured_html' in q['sql'] for q in ctx.captured_queries)
+
 
 @pytest.mark.django_db
+@pytest.mark.usefixtures("locmem_cache")
 class TestTimelineFeeds:
     """Test timeline feed modes: confort, puente, avanzado."""
 
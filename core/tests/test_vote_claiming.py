@@ -76,6 +76,27 @@ class TestVoteClaiming:
         with pytest.raises(ValidationError):
             Voto.claim_session_votes(user, session_key)
 
+    def test_claim_session_votes_conflict_claims_nothing(self):
+        """A conflict rolls back the non-conflicting votes too."""
+        user = User.objects.create_user(
+            username="testuser", password="testpass"
+        )
+        session_key = "test_session_123"
+        conflicting = Noticia.objects.create(enlace="https://example.com/news1")
+        free = Noticia.objects.create(enlace="https://example.com/news2")
+
+        Voto.objects.create(noticia=conflicting, usuario=user, opinion="buena")
+        Voto.objects.create(
+            noticia=conflicting, session_key=session_key, opinion="mala"
+        )
+        Voto.objects.create(noticia=free, session_key=session_key, opinion="buena")
+
+        with pytest.raises(ValidationError):
+            Voto.claim_session_votes(user, session_key)
+
+        assert Voto.objects.filter(session_key=session_key).count() == 2
+        assert Voto.objects.filter(usuario=user).count() == 1
+
     def test_claim_session_votes_preserves_opinions(self):
         """Claimed votes preserve their original opinions."""
         user = User.objects.create_user(
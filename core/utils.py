@@ -33,7 +33,8 @@ TRACKING_PARAMS = {
 
 def normalize_url(url):
     """
-    Normalize URL by removing tracking parameters and fragments.
+    Normalize URL by removing tracking parameters and fragments, and
+    lowercasing the host (case-insensitive per RFC 3986).
     
     This prevents duplicates when the same article is shared via different
     channels (email, social media, etc.) with different tracking parameters.
@@ -66,10 +67,14 @@ def normalize_url(url):
         # Rebuild query string (sorted for consistency)
         clean_query = urlencode(sorted(clean_params.items()), doseq=True) if clean_params else ''
         
+        # Host is case-insensitive; userinfo (rare) is kept as given
+        userinfo, at, host = parsed.netloc.rpartition('@')
+        netloc = f"{userinfo}{at}{host.lower()}"
+
         # Rebuild URL without fragment (# anchor) and with clean params
         normalized = urlunparse((
             parsed.scheme,
-            parsed.netloc,
+            netloc,
             parsed.path,
             parsed.params,
             clean_query,
@@ -435,16 +435,20 @@ class NewsTimelineView(ListView):
                 )
         elif filter_param == "buena_mayoria":
             # Filter by news with a majority of good votes
-            queryset = queryset.annotate(
-                good_count=Count("votos", filter=Q(votos__opinion="buena")),
-                total_count=Count("votos"),
-            ).filter(good_count__gt=F("total_count") / 2)
+            queryset = queryset.filter(
+                count_buena__gt=(
+                    F("count_buena") + F("count_mala") + F("count_neutral")
+                )
+                / 2
+            )
         elif filter_param == "mala_mayoria":
             # Filter by news with a majority of bad votes
-            queryset = queryset.annotate(
-                bad_count=Count("votos", filter=Q(votos__opinion="mala")),
-                total_count=Count("votos"),
-            ).filter(bad_count__gt=F("total_count") / 2)
+            queryset = queryset.filter(
+                count_mala__gt=(
+                    F("count_buena") + F("count_mala") + F("count_neutral")
+                )
+                / 2
+            )
         # Entity filters
         elif filter_param == "mencionan_a" and entidad_id:
             queryset = queryset.filter(entidades__entidad__pk=entidad_id)
@@ -682,7 +686,9 @@ class NewsTimelineView(ListView):
                     patterns = ClusterVotingPattern.objects.filter(
                         cluster=my_cluster_obj,
                         noticia_id__in=noticia_ids
-                    ).select_related('noticia')
+                    ).select_related('noticia').defer(
+                        'noticia__captured_html'
+                    )
 
                     # Create lookup dict for templates
                     cluster_patterns = {
@@ -1033,7 +1039,7 @@ class RefreshNoticiaView(LoginRequiredMixin, View):
     def post(self, request, pk):
         noticia = get_object_or_404(Noticia, pk=pk)
         try:
-            noticia.update_meta_from_url()
+            noticia.update_meta_from_url(refresh=True)
         except Exception as e:
             logger.error(f"Error refreshing noticia {pk}: {e}")
         return render(request, "noticias/timeline_item.html", {"noticia": noticia})
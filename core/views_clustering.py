@@ -11,6 +11,7 @@ from django.core.files.base import ContentFile
 from django.contrib.auth import get_user_model
 from core.models import VoterClusterRun, Voto, Noticia, UserProfile
 from core.views import get_voter_identifier
+from core.clustering.pca import quantize_projection
 from django.db.models import Count
 from django.db.models.functions import TruncDate
 from django.utils import timezone
@@ -475,8 +476,8 @@ def cluster_data_json(request):
                 pass
 
         projection_data = {
-            "x": proj.projection_x,
-            "y": proj.projection_y,
+            "x": quantize_projection(proj.projection_x),
+            "y": quantize_projection(proj.projection_y),
             "voter_type": proj.voter_type,
             "voter_id": proj.voter_id,
             "n_votes": proj.n_votes_cast,
@@ -497,8 +498,8 @@ def cluster_data_json(request):
         centroids.append(
             {
                 "cluster_id": cluster.cluster_id,
-                "x": cluster.centroid_x,
-                "y": cluster.centroid_y,
+                "x": quantize_projection(cluster.centroid_x),
+                "y": quantize_projection(cluster.centroid_y),
                 "size": cluster.size,
                 "consensus": cluster.consensus_score,
                 "name": cluster.llm_name,
@@ -510,7 +511,9 @@ def cluster_data_json(request):
 
     # Get noticia projections (biplot)
     news_projections = []
-    for np_obj in run.noticia_projections.select_related("noticia").all():
+    for np_obj in run.noticia_projections.select_related("noticia").defer(
+        "noticia__captured_html"
+    ):
         noticia = np_obj.noticia
         # Extract domain from URL as "medio"
         try:
@@ -521,8 +524,8 @@ def cluster_data_json(request):
             {
                 "id": noticia.id,
                 "slug": noticia.slug,
-                "x": np_obj.projection_x,
-                "y": np_obj.projection_y,
+                "x": quantize_projection(np_obj.projection_x),
+                "y": quantize_projection(np_obj.projection_y),
                 "n_votes": np_obj.n_votes,
                 "titulo": noticia.mostrar_titulo or "",
                 "medio": domain,
@@ -655,6 +658,13 @@ def cluster_evolution_json(request):
         if len(runs) < 2:
             return JsonResponse({"error": "Need at least 2 completed runs"}, status=404)
 
+        # Reload just the sampled runs with their group clusters prefetched
+        runs = list(
+            VoterClusterRun.objects.with_group_clusters()
+            .filter(id__in=[run.id for run in runs])
+            .order_by("created_at")
+        )
+
         # Build Sankey data
         nodes = []
         links = []
@@ -676,9 +686,7 @@ def cluster_evolution_json(request):
 
         # Build nodes
         for run in runs:
-            clusters = run.clusters.filter(cluster_type="group").order_by("cluster_id")
-
-            for cluster in clusters:
+            for cluster in run.group_clusters:
                 node_key = f"{run.id}_{cluster.cluster_id}"
                 node_map[node_key] = node_idx
 